@@ -0,0 +1,96 @@
+# bench_screens.py
+# 데스크톱 화면 전환 벤치마크: 상태마다 창을 새로 만드는 방식 vs 창 하나 + 패널 보이기/숨기기 (flash_desktop.Screens)
+# - splash→home→select→loop→study→rest→summary→home 순환, 그리고 study 화면의 F11 전환을 각각 측정
+# - 전환 1회 = 상태 변경 + 화면 갱신(win.refresh) 까지, ms 단위 중앙값/p95 → JSON 저장 (bench_select.py 와 같은 형식)
+# 화면(DISPLAY)이 있어야 실행됨.
+# 사용: python bench_screens.py [--rounds 20] [--out bench_results/screens-<커밋>.json]
+import os, sys, json, time, argparse, platform, statistics
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE)
+import PySimpleGUI as sg
+import flash_desktop as fd
+from bench_select import git_rev
+
+CYCLE = ["splash", "home", "select", "loop", "study", "rest", "summary", "home"]
+DECK = [{"keyword": f"kw{i}", "meaning": "정수 값을 표현", "usage_one_liner": "x = 42"} for i in range(30)]
+
+def legacy_window(ctx):
+    """예전 make_window: 상태마다 sg.Window 를 새로 만듦"""
+    kw = dict(finalize=True, return_keyboard_events=True)
+    if ctx.state == "study": kw["resizable"] = True
+    if ctx.state == "rest": kw.update(modal=True, keep_on_top=True)
+    win = sg.Window("Meditation" if ctx.state == "rest" else fd.TITLE, fd.PANES[ctx.state](ctx), **kw)
+    if ctx.state == "study": ctx.view = None; fd.render_card(win, ctx)
+    return win
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+def summarize(ms: list) -> dict:
+    ms = sorted(ms)
+    return {"median_ms": round(statistics.median(ms), 2),
+            "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 2),
+            "max_ms": round(ms[-1], 2), "n": len(ms)}
+
+def bench_legacy(ctx, rounds: int) -> dict:
+    sw, full = [], []
+    ctx.state = CYCLE[0]; win = legacy_window(ctx)
+    def switch(state):
+        nonlocal win
+        win.close(); ctx.state = state; win = legacy_window(ctx); win.refresh()
+    def f11():
+        nonlocal win
+        ctx.fullscreen = not ctx.fullscreen; fd.set_card_metrics(ctx, ctx.fullscreen)
+        win.close(); win = legacy_window(ctx); win.refresh()
+    for _ in range(rounds):
+        for st in CYCLE[1:]:
+            sw.append(timed(lambda: switch(st)))
+            if st == "study":
+                full += [timed(f11), timed(f11)]
+    win.close()
+    return {"switch": summarize(sw), "f11": summarize(full)}
+
+def bench_panes(ctx, rounds: int) -> dict:
+    cold, sw, full = [], [], []
+    ctx.state = CYCLE[0]; ctx.view = None; win = fd.Screens().show(ctx)
+    def switch(state):
+        ctx.state = state; win.show(ctx)
+        if state == "study": fd.render_card(win, ctx)
+        win.refresh()
+    def f11():
+        fd.toggle_full(win, ctx); win.refresh()
+    for r in range(rounds + 1):
+        for st in CYCLE[1:]:
+            (cold if r == 0 else sw).append(timed(lambda: switch(st)))   # 첫 바퀴 = 패널 생성
+            if st == "study" and r:
+                full += [timed(f11), timed(f11)]
+    win.close()
+    return {"first_show": summarize(cold), "switch": summarize(sw), "f11": summarize(full)}
+
+def run(rounds: int) -> dict:
+    results = {}
+    for name, fn in (("new_window", bench_legacy), ("panes", bench_panes)):
+        ctx = fd.Ctx(); ctx.speech.close()
+        ctx.deck, ctx.idx, ctx.auto_tts, ctx.round_no = DECK, 0, False, 1
+        results[name] = fn(ctx, rounds)
+        for kind, r in results[name].items():
+            print(f"{name:10s} {kind:10s} median {r['median_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f} ms  max {r['max_ms']:>8.2f} ms  (n={r['n']})")
+    return {"commit": git_rev(), "python": platform.python_version(), "machine": platform.machine(),
+            "pysimplegui": getattr(sg, "__version__", "?"), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "rounds": rounds, "results": results}
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="desktop screen switch benchmark")
+    ap.add_argument("--rounds", type=int, default=20, help="상태 순환 횟수")
+    ap.add_argument("--out", default=None, help="결과 JSON (기본 bench_results/screens-<커밋>.json)")
+    args = ap.parse_args()
+
+    report = run(args.rounds)
+    out = args.out or os.path.join(BASE, "bench_results", f"screens-{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"저장: {out}")
@@ -0,0 +1,125 @@
+# bench_select.py
+# 덱 선택 함수 벤치마크 (10k / 100k / 1M 합성 덱)
+# - python_master.json 모양(tags core/applied/…) 과 english_pattern.json 모양(items 묶음) 덱을 생성
+# - flash_learning / flash_desktop 의 pick_round1/2/3, pick_english, ensure_page 를 측정
+# - ops/sec + 1회 호출 peak 메모리(tracemalloc) → JSON 저장, --compare 로 커밋 간 비교
+# 사용: python bench_select.py [--sizes 10000,100000,1000000] [--budget 1.0] [--out bench_results/<커밋>.json]
+#       python bench_select.py --compare bench_results/old.json
+import os, sys, json, time, random, argparse, platform, subprocess, tracemalloc
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+PAGE = 30
+
+# -------------------- 합성 덱 --------------------
+TAG_SETS = [["core", "datatype"], ["core", "control"], ["applied", "io"], ["applied", "pattern"],
+            ["stdlib"], ["advanced", "typing"]]
+MEANINGS = ["정수 값을 표현", "가변 시퀀스", "조건 분기", "예외 처리", "파일 읽기", "반복 제어"]
+USAGES = ["x = 42", "arr = [1,2,3]", "if x: pass", "try: ...", "open('a.txt')", "for i in range(3): ..."]
+
+def make_master(n: int, seed: int = 7) -> list:
+    """python_master.json 모양 (태그/문자열은 공유 객체로 메모리 절약)"""
+    rng = random.Random(seed)
+    return [{
+        "domain": "python", "level": 1 + i % 5,
+        "keyword": f"kw{i:07d}", "meaning": MEANINGS[i % 6], "usage_one_liner": USAGES[i % 6],
+        "order_index": rng.randrange(n * 2), "tags": TAG_SETS[rng.randrange(len(TAG_SETS))],
+        "doc_url": "https://docs.python.org/3.13/tutorial/", "doc_section": "bench",
+    } for i in range(n)]
+
+def make_pattern(n: int) -> list:
+    """english_pattern.json 모양 (items 묶음은 100종을 돌려 씀)"""
+    bundles = [[{"en": f"I need thing {b}-{j}.", "ko": f"물건 {b}-{j} 필요해."} for j in range(12)] for b in range(100)]
+    return [{
+        "domain": "english", "category": "pattern", "level": 0,
+        "keyword": f"Pattern {i:07d} ...", "meaning": "", "usage_one_liner": "",
+        "order_index": i + 1, "tags": ["pattern", "daily"], "bundle_id": i,
+        "items": bundles[i % 100], "doc_source": "bench", "doc_section": f"{i}. bench",
+    } for i in range(n)]
+
+# -------------------- 측정 --------------------
+def measure(fn, budget: float) -> dict:
+    fn()                                            # 워밍업 1회
+    n, t0 = 0, time.perf_counter()
+    while True:
+        fn(); n += 1
+        dt = time.perf_counter() - t0
+        if dt >= budget: break
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ops_per_sec": round(n / dt, 3), "calls": n, "peak_kb": round(peak / 1024, 1)}
+
+def cases(mod, master: list, pattern: list):
+    """모듈에 있는 함수만 측정 대상으로"""
+    rng = random.Random(1)
+    prev = rng.sample(range(len(master)), 2 * PAGE)                 # r1+r2 이후 상태 (카드 id)
+    seen_en = rng.sample(range(len(pattern)), 2 * PAGE)
+    if hasattr(mod, "IdSet"):                                        # id 비트셋 세션 상태
+        prev, seen_en = mod.IdSet(prev), mod.IdSet(seen_en)
+    else:
+        prev, seen_en = {master[i]["keyword"] for i in prev}, {pattern[i]["keyword"] for i in seen_en}
+    level = master[:10]                                              # 레벨 부족 → 마스터 보충
+    out = {}
+    if hasattr(mod, "pick_round1"):
+        out["pick_round1"] = lambda: mod.pick_round1(master, start=3, page=PAGE)
+    out["pick_round2"] = lambda: mod.pick_round2(master, page=PAGE, seed=1)
+    out["pick_round3"] = lambda: mod.pick_round3(master, prev, page=PAGE, seed=1)
+    if hasattr(mod, "pick_english"):
+        out["pick_english"] = lambda: mod.pick_english(pattern, seen_en, PAGE, 1)
+    if hasattr(mod, "ensure_page"):
+        mod.load_master = lambda domain: master                     # 합성 마스터 주입
+        out["ensure_page"] = lambda: mod.ensure_page(level, "python", PAGE)
+    return out
+
+def git_rev() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BASE, text=True).strip()
+    except Exception:
+        return "unknown"
+
+def run(sizes, budget: float) -> dict:
+    sys.path.insert(0, BASE)
+    mods = {}
+    for name in ("flash_learning", "flash_desktop"):
+        try:
+            mods[name] = __import__(name)
+        except ImportError as ex:                                    # GUI/TTS 미설치 환경
+            print(f"[skip] {name}: {ex}")
+    results = {}
+    for n in sizes:
+        master, pattern = make_master(n), make_pattern(n)
+        for mname, mod in mods.items():
+            for fname, fn in cases(mod, master, pattern).items():
+                r = measure(fn, budget)
+                results[f"{mname}.{fname}@{n}"] = r
+                print(f"{mname:15s} {fname:13s} n={n:<8d} {r['ops_per_sec']:>12.1f} ops/s  peak {r['peak_kb']:>10.1f} KB")
+        del master, pattern
+    return {"commit": git_rev(), "python": platform.python_version(), "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "budget_s": budget, "results": results}
+
+def compare(old: dict, new: dict):
+    print(f"\n비교: {old.get('commit')} → {new.get('commit')}")
+    for key, r in new["results"].items():
+        o = old.get("results", {}).get(key)
+        if not o: continue
+        ratio = r["ops_per_sec"] / max(o["ops_per_sec"], 1e-9)
+        print(f"{key:45s} {o['ops_per_sec']:>12.1f} → {r['ops_per_sec']:>12.1f} ops/s  x{ratio:.2f}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="deck selection benchmark")
+    ap.add_argument("--sizes", default="10000,100000,1000000")
+    ap.add_argument("--budget", type=float, default=1.0, help="케이스당 측정 시간(초)")
+    ap.add_argument("--out", default=None, help="결과 JSON (기본 bench_results/<커밋>.json)")
+    ap.add_argument("--compare", default=None, help="이전 결과 JSON 과 비교")
+    args = ap.parse_args()
+
+    report = run([int(x) for x in args.sizes.split(",") if x], args.budget)
+    out = args.out or os.path.join(BASE, "bench_results", f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"저장: {out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
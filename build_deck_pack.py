@@ -0,0 +1,32 @@
+# build_deck_pack.py
+# JSON 덱 → 컴파일된 덱(.fdk) 변환기 (flash_deckpack.py 포맷)
+# - 각 <이름>.json 옆에 <이름>.fdk 생성 → 세 프런트엔드가 JSON 파싱 없이 mmap으로 읽음
+# 사용: python build_deck_pack.py            (루트 + data/ 의 모든 덱)
+#       python build_deck_pack.py a.json b.json
+import sys, json, time
+from pathlib import Path
+from flash_deckpack import write_pack, pack_path
+
+BASE = Path(__file__).parent.resolve()
+
+def deck_files():
+    for d in (BASE, BASE / "data"):
+        for p in sorted(d.glob("*.json")):
+            if p.name.startswith("manifest"): continue
+            yield p
+
+def build(path: Path):
+    rows = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(rows, list):
+        return
+    t0 = time.perf_counter()
+    out = pack_path(str(path))
+    write_pack(rows, out)
+    kb_in, kb_out = path.stat().st_size / 1024, Path(out).stat().st_size / 1024
+    print(f"[pack] {path.relative_to(BASE)}: {len(rows)} cards  {kb_in:.0f}KB → {kb_out:.0f}KB  ({(time.perf_counter()-t0)*1000:.0f}ms)")
+
+if __name__ == "__main__":
+    targets = [Path(a).resolve() for a in sys.argv[1:]] or list(deck_files())
+    for p in targets:
+        build(p)
+    print("OK: .fdk 생성 완료")
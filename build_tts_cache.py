@@ -0,0 +1,107 @@
+# build_tts_cache.py
+# 영어 덱의 발화 문장(EN/KO)을 오프라인 엔진으로 미리 합성 → tts_cache/<텍스트+보이스 해시>.wav
+# - 엔진: pyttsx3 (Windows SAPI5 / Linux espeak 드라이버), 없으면 espeak-ng / espeak 명령
+# - 이미 있는 클립은 건너뜀 (내용 주소라서 덱이 바뀌어도 바뀐 문장만 새로 합성)
+# 사용: python build_tts_cache.py [--lang en,ko] [--voice-en ID] [--voice-ko ID] [--limit N] [--dry-run]
+import os, sys, json, time, shutil, argparse, subprocess
+from pathlib import Path
+from flash_tts import TTS_DIR, LANGS, utterance_en, utterance_ko, clip_key, clip_path, voices_path, load_voices
+import flash_repo as repo
+
+BASE = Path(__file__).parent.resolve()
+UTTER = {"en": utterance_en, "ko": utterance_ko}
+ESPEAK_VOICE = {"en": "en-us", "ko": "ko"}
+
+def utterances(langs) -> dict:
+    """{lang: {텍스트, ...}} — data/ 의 영어 카테고리 덱 전체"""
+    out = {lang: set() for lang in langs}
+    for cat, fname in repo.EN_FILES.items():
+        for c in repo.load_path(str(BASE / "data" / fname)):
+            c = dict(c); c.setdefault("category", cat)
+            for lang in langs:
+                t = UTTER[lang](c)
+                if t: out[lang].add(t)
+    return out
+
+# ---------- 엔진 ----------
+class Pyttsx3Engine:
+    name = "pyttsx3"
+    def __init__(self):
+        import pyttsx3
+        self.eng = pyttsx3.init()
+        self.eng.setProperty("rate", 180)
+
+    def pick_voice(self, lang: str) -> str | None:
+        for v in self.eng.getProperty("voices"):
+            names = [(getattr(v, "id", "") or "").lower(), (getattr(v, "name", "") or "").lower()]
+            names += [str(x).lower() for x in (getattr(v, "languages", None) or [])]
+            if any(lang in x for x in names): return v.id
+        return None
+
+    def synth(self, text: str, voice: str, out: str):
+        self.eng.setProperty("voice", voice)
+        self.eng.save_to_file(text, out)
+        self.eng.runAndWait()
+
+class EspeakEngine:
+    def __init__(self):
+        self.cmd = shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.cmd: raise RuntimeError("espeak 없음")
+        self.name = os.path.basename(self.cmd)
+
+    def pick_voice(self, lang: str) -> str | None:
+        return ESPEAK_VOICE.get(lang)
+
+    def synth(self, text: str, voice: str, out: str):
+        subprocess.run([self.cmd, "-v", voice, "-s", "170", "-w", out, text], check=True, capture_output=True)
+
+def open_engine():
+    errors = []
+    for cls in (Pyttsx3Engine, EspeakEngine):
+        try:
+            return cls()
+        except Exception as ex:
+            errors.append(f"{cls.__name__}: {ex}")
+    sys.exit("TTS 엔진을 찾지 못함 — " + "; ".join(errors))
+
+# ---------- 빌드 ----------
+def build(langs, voices: dict, limit: int | None, dry_run: bool):
+    todo = utterances(langs)
+    engine = None if dry_run else open_engine()
+    if not dry_run: os.makedirs(TTS_DIR, exist_ok=True)
+    known = load_voices()
+    for lang in langs:
+        voice = voices.get(lang) or known.get(lang) or (engine.pick_voice(lang) if engine else "?")
+        if voice is None:
+            print(f"[skip] {lang}: 보이스 없음 (--voice-{lang} 로 지정)"); continue
+        known[lang] = voice
+        texts = sorted(todo[lang])
+        missing = [t for t in texts if not os.path.exists(clip_path(clip_key(t, voice)))]
+        if limit is not None: missing = missing[:limit]
+        print(f"[{lang}] voice={voice}  문장 {len(texts)}개, 새로 합성 {len(missing)}개")
+        if dry_run: continue
+        t0 = time.perf_counter()
+        for i, text in enumerate(missing, 1):
+            out = clip_path(clip_key(text, voice))
+            tmp = out + ".tmp" + os.path.splitext(out)[1]
+            try:
+                engine.synth(text, voice, tmp)
+                os.replace(tmp, out)
+            except Exception as ex:
+                print(f"  실패: {text[:40]!r}: {ex}")
+            if i % 50 == 0: print(f"  {i}/{len(missing)}  ({time.perf_counter()-t0:.0f}s)")
+    if not dry_run:
+        with open(voices_path(), "w", encoding="utf-8") as f:
+            json.dump(known, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="pre-render TTS clips for the web app")
+    ap.add_argument("--lang", default=",".join(LANGS))
+    ap.add_argument("--voice-en", default=None)
+    ap.add_argument("--voice-ko", default=None)
+    ap.add_argument("--limit", type=int, default=None, help="언어별 최대 합성 수 (시험용)")
+    ap.add_argument("--dry-run", action="store_true", help="합성 없이 개수만")
+    args = ap.parse_args()
+    langs = [x for x in args.lang.split(",") if x in LANGS]
+    build(langs, {"en": args.voice_en, "ko": args.voice_ko}, args.limit, args.dry_run)
+    print(f"OK: {TTS_DIR}")
@@ -0,0 +1,56 @@
+# flash_clock.py — 이름 붙은 마감 시각 힙 (데스크톱 메인 루프의 타이머)
+# 폴링(read(timeout=50)) 대신 다음 마감까지만 기다린다:
+#   event, values = win.read(timeout=clock.timeout_ms())    # 마감이 없으면 None → 이벤트가 올 때까지
+#   if event == sg.TIMEOUT_KEY: event = clock.pop_due() or event
+# 같은 이름을 다시 넣으면 이전 마감은 무효 (힙에서는 꺼낼 때 버림).
+from __future__ import annotations
+import time, heapq, math
+
+class Deadlines:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._heap: list = []
+        self._when: dict = {}           # 이름 → 유효한 마감 시각
+        self._fired: dict = {}          # 이름 → 마지막으로 꺼낸 마감 시각 (again() 의 기준)
+
+    def at(self, name: str, t: float):
+        if self._when.get(name) == t: return
+        self._when[name] = t
+        heapq.heappush(self._heap, (t, name))
+
+    def after(self, name: str, delay: float):
+        self.at(name, self.clock() + delay)
+
+    def again(self, name: str, period: float):
+        """마지막 마감 + period (밀리지 않는 주기). 한 주기 넘게 늦었으면 지금 + period"""
+        now = self.clock()
+        t = self._fired.get(name, now) + period
+        self.at(name, t if t > now - period else now + period)
+
+    def cancel(self, *names: str):
+        for name in names: self._when.pop(name, None)
+
+    def pending(self, name: str) -> bool:
+        return name in self._when
+
+    def _top(self):
+        h = self._heap
+        while h and self._when.get(h[0][1]) != h[0][0]:
+            heapq.heappop(h)
+        return h[0] if h else None
+
+    def timeout_ms(self) -> int | None:
+        """다음 마감까지(ms, 올림). 마감이 없으면 None"""
+        top = self._top()
+        if top is None: return None
+        return max(0, math.ceil((top[0] - self.clock()) * 1000))
+
+    def pop_due(self) -> str | None:
+        """지난 마감 하나 (가장 이른 것). 없으면 None"""
+        top = self._top()
+        if top is None or top[0] > self.clock(): return None
+        heapq.heappop(self._heap)
+        t, name = top
+        del self._when[name]
+        self._fired[name] = t
+        return name
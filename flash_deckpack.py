@@ -0,0 +1,158 @@
+# flash_deckpack.py — 컴파일된 덱 포맷(.fdk): 열(column) 단위 + 문자열 테이블(intern) + mmap 지연 디코드
+# JSON 덱과 같은 자리에 <이름>.fdk 가 있고 더 새것이면 load_deck()이 그것을 연다 (build_deck_pack.py로 생성).
+#
+# 레이아웃 (little-endian, 모든 구간 4바이트 정렬):
+#   header  : magic "FDK1", version, n_cards, n_fields, n_strings, n_lists, pool_len, reserved (u32 x8)
+#   fields  : (name_sid u32, type u32) x n_fields              type: s=문자열 i=정수 l=문자열 리스트 j=JSON
+#   columns : u32/i32 x n_cards, 필드마다 한 열              s/j → 문자열 id, i → 값, l → 리스트 id
+#   str_off : u32 x (n_strings+1)                            문자열 blob 안의 시작 위치
+#   list_off: u32 x (n_lists+1)                              pool 안의 시작 위치 (같은 태그 묶음은 한 번만 저장)
+#   pool    : u32 x pool_len                                 리스트 원소(문자열 id)
+#   blob    : utf-8 문자열들
+# 카드 id = 덱 안의 위치 (디코드된 카드에 "id"로 붙음)
+from __future__ import annotations
+import os, json, mmap, struct
+from collections.abc import Sequence
+
+MAGIC = b"FDK1"
+VERSION = 1
+HEADER = struct.Struct("<4s7I")
+MISSING = 0xFFFFFFFF                # s/l/j 열의 빈 값
+INT_MISSING = -2**31                # i 열의 빈 값
+PACK_EXT = ".fdk"
+
+def _field_type(values) -> str:
+    vals = [v for v in values if v is not None]
+    if all(isinstance(v, str) for v in vals): return "s"
+    if all(type(v) is int and INT_MISSING < v < 2**31 for v in vals): return "i"
+    if all(isinstance(v, list) and all(isinstance(x, str) for x in v) for v in vals): return "l"
+    return "j"
+
+def write_pack(cards: list, path: str):
+    """카드 리스트를 .fdk 로 기록 (임시 파일에 쓴 뒤 교체)"""
+    fields: list[str] = []
+    for c in cards:
+        for k in c:
+            if k not in fields and k != "id": fields.append(k)
+    strings: dict[str, int] = {}
+    lists: dict[tuple, int] = {}
+    pool: list[int] = []
+    list_off = [0]
+
+    def sid(s: str) -> int:
+        i = strings.get(s)
+        if i is None: i = strings[s] = len(strings)
+        return i
+
+    def lid(seq: list) -> int:
+        key = tuple(sid(x) for x in seq)
+        i = lists.get(key)
+        if i is None:
+            i = lists[key] = len(lists)
+            pool.extend(key); list_off.append(len(pool))
+        return i
+
+    types = [_field_type(c.get(f) for c in cards) for f in fields]
+    name_ids = [sid(f) for f in fields]
+    columns = []
+    for f, t in zip(fields, types):
+        col = []
+        for c in cards:
+            v = c.get(f)
+            if v is None: col.append(INT_MISSING if t == "i" else MISSING)
+            elif t == "s": col.append(sid(v))
+            elif t == "i": col.append(v)
+            elif t == "l": col.append(lid(v))
+            else: col.append(sid(json.dumps(v, ensure_ascii=False, separators=(",", ":"))))
+        columns.append(struct.pack(f"<{len(col)}{'i' if t == 'i' else 'I'}", *col))
+
+    blob = bytearray(); str_off = [0]
+    for s in strings:                       # dict는 삽입 순서 = id 순서
+        blob += s.encode("utf-8"); str_off.append(len(blob))
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(cards), len(fields), len(strings), len(lists), len(pool), 0))
+        for n, t in zip(name_ids, types):
+            f.write(struct.pack("<II", n, ord(t)))
+        for col in columns: f.write(col)
+        f.write(struct.pack(f"<{len(str_off)}I", *str_off))
+        f.write(struct.pack(f"<{len(list_off)}I", *list_off))
+        f.write(struct.pack(f"<{len(pool)}I", *pool))
+        f.write(blob)
+    os.replace(tmp, path)
+
+class PackedDeck(Sequence):
+    """mmap 된 .fdk 를 카드 리스트처럼 사용. 카드는 접근할 때 디코드된다."""
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mv = memoryview(self._mm)
+        magic, ver, n, nf, ns, nl, npool, _ = HEADER.unpack_from(mv, 0)
+        if magic != MAGIC or ver != VERSION:
+            raise ValueError(f"not a deck pack: {path}")
+        self._n = n
+        pos = HEADER.size
+        ft = mv[pos:pos + 8 * nf].cast("I"); pos += 8 * nf
+        col_specs = [(ft[2 * i], chr(ft[2 * i + 1])) for i in range(nf)]
+        cols = []
+        for _, t in col_specs:
+            cols.append(mv[pos:pos + 4 * n].cast("i" if t == "i" else "I")); pos += 4 * n
+        self._str_off = mv[pos:pos + 4 * (ns + 1)].cast("I"); pos += 4 * (ns + 1)
+        self._list_off = mv[pos:pos + 4 * (nl + 1)].cast("I"); pos += 4 * (nl + 1)
+        self._pool = mv[pos:pos + 4 * npool].cast("I"); pos += 4 * npool
+        self._blob = mv[pos:]
+        self.fields = [(self.string(sid), t, col) for (sid, t), col in zip(col_specs, cols)]
+        self._columns = {name: (t, col) for name, t, col in self.fields}
+
+    def string(self, sid: int) -> str:
+        return str(self._blob[self._str_off[sid]:self._str_off[sid + 1]], "utf-8")
+
+    def _list(self, lid: int) -> list:
+        return [self.string(x) for x in self._pool[self._list_off[lid]:self._list_off[lid + 1]]]
+
+    def _decode(self, t: str, raw: int):
+        if t == "i": return None if raw == INT_MISSING else raw
+        if raw == MISSING: return None
+        if t == "s": return self.string(raw)
+        if t == "l": return self._list(raw)
+        return json.loads(self.string(raw))
+
+    def value(self, i: int, field: str):
+        """카드 하나의 필드 하나만 디코드 (카드 전체를 만들지 않음)"""
+        t, col = self._columns[field]
+        return self._decode(t, col[i])
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0: i += self._n
+        if not 0 <= i < self._n: raise IndexError(i)
+        card = {}
+        for name, t, col in self.fields:
+            raw = col[i]
+            if raw != (INT_MISSING if t == "i" else MISSING):
+                card[name] = self._decode(t, raw)
+        card["id"] = i
+        return card
+
+def pack_path(json_path: str) -> str:
+    return os.path.splitext(json_path)[0] + PACK_EXT
+
+def load_deck(json_path: str) -> Sequence:
+    """같은 이름의 .fdk 가 JSON보다 새것이면 mmap 으로, 아니면 JSON 으로 읽는다. 없으면 []"""
+    pk = pack_path(json_path)
+    if os.path.exists(pk):
+        src_mtime = os.path.getmtime(json_path) if os.path.exists(json_path) else -1
+        if os.path.getmtime(pk) >= src_mtime:
+            try:
+                return PackedDeck(pk)
+            except (OSError, ValueError):
+                pass
+    if not os.path.exists(json_path): return []
+    with open(json_path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,115 @@
+# flash_delta.py — 카드별 내용 해시, 덱 버전, 버전 간 델타
+# 카드 해시 = "id"를 뺀 카드 JSON(키 정렬)의 sha1 앞 16자. 덱 버전 = 카드 해시를 순서대로 이은 것의 sha1 앞 16자.
+# 서버가 덱을 읽을 때마다 버전별 (카드 해시, keyword 해시) 목록을 VERSIONS_DIR 에 남겨 두고,
+# 클라이언트가 가진 버전에서 지금 버전으로 가는 델타를 계산한다:
+#   copy    [[새 id 시작, 옛 id 시작, 길이], ...]  — 내용이 그대로인 카드 (클라이언트 사본에서 복사)
+#   added   새 카드 (keyword도 처음 보는 것)
+#   changed 내용이 바뀐 카드 (같은 keyword의 옛 카드가 사라짐)
+#   removed 사라진 옛 id
+from __future__ import annotations
+import os, re, json, hashlib, threading
+from collections import OrderedDict, deque
+
+VERSIONS_DIR = os.environ.get("FLASH_DECK_VERSIONS_DIR") or os.path.join(os.path.expanduser("~"), ".flash_learning", "deck_versions")
+CACHE_SIZE = 16
+
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+def card_hash(c: dict) -> str:
+    body = {k: v for k, v in c.items() if k != "id"}
+    raw = json.dumps(body, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def key_hash(c: dict) -> str:
+    return hashlib.sha1(str(c.get("keyword", "")).encode("utf-8")).hexdigest()[:12]
+
+def deck_version(hashes: list) -> str:
+    return hashlib.sha1("".join(hashes).encode("ascii")).hexdigest()[:16]
+
+class DeckSnapshot:
+    """한 버전의 덱 요약: 카드 해시/keyword 해시 (id 순)"""
+    __slots__ = ("hashes", "keys", "version")
+    def __init__(self, hashes: list, keys: list):
+        self.hashes, self.keys = hashes, keys
+        self.version = deck_version(hashes)
+
+    @classmethod
+    def of(cls, cards) -> "DeckSnapshot":
+        cards = [cards[i] for i in range(len(cards))]
+        return cls([card_hash(c) for c in cards], [key_hash(c) for c in cards])
+
+class VersionStore:
+    """덱 이름 → 버전별 스냅샷 (디스크: <dir>/<덱>/<버전>.json, 메모리: 작은 LRU)"""
+    def __init__(self, root: str = VERSIONS_DIR):
+        self.root = root
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, deck: str, version: str) -> str:
+        return os.path.join(self.root, _SAFE.sub("_", deck), _SAFE.sub("_", version) + ".json")
+
+    def _remember(self, deck: str, snap: DeckSnapshot):
+        with self._lock:
+            self._cache[(deck, snap.version)] = snap
+            self._cache.move_to_end((deck, snap.version))
+            while len(self._cache) > CACHE_SIZE: self._cache.popitem(last=False)
+
+    def record(self, deck: str, snap: DeckSnapshot):
+        """스냅샷 저장 (이미 있으면 그대로). 디스크에 못 쓰면 메모리에만"""
+        self._remember(deck, snap)
+        path = self._path(deck, snap.version)
+        if os.path.exists(path): return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"hashes": snap.hashes, "keys": snap.keys}, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def get(self, deck: str, version: str) -> DeckSnapshot | None:
+        with self._lock:
+            snap = self._cache.get((deck, version))
+        if snap is not None: return snap
+        try:
+            with open(self._path(deck, version), encoding="utf-8") as f:
+                doc = json.load(f)
+            snap = DeckSnapshot(doc["hashes"], doc["keys"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if snap.version != version: return None
+        self._remember(deck, snap)
+        return snap
+
+VERSIONS = VersionStore()
+
+def diff(old: DeckSnapshot, new: DeckSnapshot) -> dict:
+    """옛 스냅샷 → 새 스냅샷: copy 구간 + added/changed 새 id + removed 옛 id"""
+    where: dict[str, deque] = {}
+    for i, h in enumerate(old.hashes):
+        where.setdefault(h, deque()).append(i)
+    runs: list[list[int]] = []
+    fresh: list[int] = []
+    for j, h in enumerate(new.hashes):
+        q = where.get(h)
+        if not q:
+            fresh.append(j); continue
+        r = runs[-1] if runs else None
+        if r and r[0] + r[2] == j and r[1] + r[2] in q:    # 같은 내용의 카드가 여럿이면 이어지는 쪽을 골라 구간 유지
+            q.remove(r[1] + r[2]); r[2] += 1
+        else:
+            runs.append([j, q.popleft(), 1])
+    gone = sorted(i for q in where.values() for i in q)
+    gone_keys: dict[str, deque] = {}
+    for i in gone:
+        gone_keys.setdefault(old.keys[i], deque()).append(i)
+    added, changed, replaced = [], [], set()
+    for j in fresh:
+        q = gone_keys.get(new.keys[j])
+        if q:
+            changed.append(j); replaced.add(q.popleft())
+        else:
+            added.append(j)
+    return {"copy": runs, "added": added, "changed": changed,
+            "removed": [i for i in gone if i not in replaced]}
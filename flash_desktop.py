@@ -1,16 +1,32 @@
 # flash_desktop.py  (Python 3.13 + PySimpleGUI 5.x)
 # v4.7 — English=카테고리 UI 고정, 항상 랜덤·중복 최소화, r1→휴식→r2→휴식→r3 자동, 전체화면 리스케일
+# 시작 시간: FLASH_STARTUP_TIMING=1 이면 단계별 시각을 stderr 로 (모듈별 import 는 python -X importtime flash_desktop.py)
 
-import os, json, time, random
+import time
+_T0 = time.perf_counter()                       # 시작 시간 측정 기준 (다른 import 보다 먼저)
+import os, sys, json, random, threading
 import PySimpleGUI as sg
-import pyttsx3          # TTS 엔진 (윈도우 SAPI5)
-import threading        # 비동기 재생(UI 멈춤 방지)
-
-
-try:
-    import winsound
-except Exception:
-    winsound = None
+from flash_speech import SpeechWorker   # TTS 전담 스레드 (길이 제한 큐, 지난 카드 발화 취소)
+from flash_srs import Scheduler, card_key, GRADE_SEEN, GRADE_AGAIN   # 간격 반복(세션 간 복습 기록)
+import flash_repo as repo               # 공용 카드 저장소 (LRU 캐시, .fdk/JSON)
+from flash_sampler import index_for, sample_round3, sample_english   # 정수 id 기반 O(k) 샘플러
+from flash_idset import IdSet, as_idset         # 세션의 본 카드 = 카드 id 비트셋
+import flash_profile                            # FLASH_PROFILE=cprofile|sample 이면 이벤트 처리 구간 프로파일
+from flash_textfit import fit, TkMetrics        # 카드 텍스트 자동 맞춤 (레이아웃 LRU 캐시)
+from flash_clock import Deadlines               # 메인 루프 타이머 (다음 마감까지만 대기)
+from flash_tones import tone_player             # 미리 만든 신호음 (오디오 스레드, 윈도우만)
+
+STARTUP_TIMING = bool(os.environ.get("FLASH_STARTUP_TIMING"))
+_last_mark = [_T0]
+
+def startup_mark(phase: str):
+    """-X importtime 처럼: 직전 표시부터(ms) | 시작부터 누적(ms) | 단계"""
+    if not STARTUP_TIMING: return
+    t = time.perf_counter()
+    print(f"startup: {(t - _last_mark[0]) * 1000:9.1f} | {(t - _T0) * 1000:9.1f} | {phase} [{threading.current_thread().name}]", file=sys.stderr)
+    _last_mark[0] = t
+
+startup_mark("imports")
 
 TITLE        = "Flash Learning"
 DATA_DIR     = os.path.dirname(__file__)
@@ -22,6 +38,18 @@ INHALE_S = 4
 HOLD_S   = 4
 EXHALE_S = 6
 CYCLE_S  = INHALE_S + HOLD_S + EXHALE_S
+BREATH_FRAME_S = 0.05
+BREATH_R = (30, 110)                                            # 반지름 최소/최대
+BREATH_COLORS = {"들이마시기":"#7fdcff","멈춤":"#a0ffa0","내쉬기":"#ffd07f"}
+BEEP_HZ = {"들이마시기": 880, "멈춤": 700, "내쉬기": 550}        # 단계 신호음 (120ms)
+
+# 메인 루프 타이머 이벤트 (Deadlines 이름 = 이벤트 키)
+T_AUTO   = "-T_AUTO-"       # study 자동 넘김
+T_REST   = "-T_REST-"       # 휴식 남은 시간 1초
+T_BREATH = "-T_BREATH-"     # 호흡 원 프레임
+T_PHASE  = "-T_PHASE-"      # 호흡 단계 바뀜 (소리 + 라벨)
+T_OUT    = "-T_OUT-"        # OUTPUT 타이머 1초
+TIMERS   = (T_AUTO, T_REST, T_BREATH, T_PHASE, T_OUT)
 
 TEXT_COLOR = "#FFFFFF"
 KEY_BG     = "#111111"
@@ -35,6 +63,7 @@ except Exception:
 # --------- TTS helpers ---------
 def tts_init():
     try:
+        import pyttsx3                                      # TTS 엔진 (윈도우 SAPI5) — 작업 스레드에서 늦게 로드
         eng = pyttsx3.init()                                # (모듈 초기화 + 기본 SAPI 보이스 로드)
         eng.setProperty('rate', 180)                        # (발화속도) 180 wpm 정도
         eng.setProperty('volume', 1.0)                      # (볼륨) 0.0~1.0
@@ -60,21 +89,16 @@ def tts_pick_voice(engine, lang_hint: str):
         pass
     return None
 
-def tts_say_async(ctx, text: str, voice_id: str | None):
-    """UI가 멈추지 않도록 TTS는 별 스레드에서 실행"""
-    if not ctx.tts_engine or not text: 
-        return
-    def run():
-        try:
-            eng = ctx.tts_engine
-            eng.stop()                                      # (겹침 방지) 이전 재생 중지
-            if voice_id:
-                eng.setProperty('voice', voice_id)          # (보이스 선택)
-            eng.say(text)                                   # (큐에 등록)
-            eng.runAndWait()                                # (재생 + 완료까지 대기, 스레드 안에서)
-        except Exception:
-            pass
-    threading.Thread(target=run, daemon=True).start()
+def tts_open():
+    """TTS 작업 스레드에서: 엔진 + EN/KO 보이스 검색 (시작 화면을 막지 않음)"""
+    eng = tts_init()
+    voices = {lang: tts_pick_voice(eng, lang) for lang in ("en", "ko")} if eng else {}
+    startup_mark("tts ready" if eng else "tts unavailable")
+    return eng, {k: v for k, v in voices.items() if v}
+
+def tts_say_async(ctx, text: str, channel: str, delay: float = 0.0):
+    """UI가 멈추지 않도록 TTS는 작업 스레드에서 실행 (지금 카드 발화로 표시 → 넘기면 취소, 보이스는 채널별)"""
+    ctx.speech.say(text, tag=(ctx.round_no, ctx.idx), channel=channel, delay=delay)
 
 def speak_en(ctx):
     c = ctx.cur_card()
@@ -84,15 +108,15 @@ def speak_en(ctx):
         text = (c.get("keyword","") + ". " + ". ".join([x for x in lines if x])).strip()
     else:
         text = c.get("usage_one_liner") or c.get("keyword","")
-    tts_say_async(ctx, text, ctx.voice_en or None)
+    tts_say_async(ctx, text, "en")
 
-def speak_ko(ctx):
+def speak_ko(ctx, delay: float = 0.0):
     c = ctx.cur_card()
     if not c: return
     text = c.get("meaning") or ""
     if not text and c.get("items"):
         text = " ".join([it.get("ko","") for it in c["items"][:3]])
-    tts_say_async(ctx, text, ctx.voice_ko or None)
+    tts_say_async(ctx, text, "ko", delay)
 # --------------------------------
 
 def _screen_size():
@@ -121,102 +145,151 @@ def set_card_metrics(ctx, fullscreen: bool):
         ctx.usage_h= 200
         ctx.font_scale = 1.0
 
-def _load_json(path):
-    if not os.path.exists(path): return []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
+# 덱 로드는 flash_repo 캐시를 거친다 (회차마다 다시 불러도 파일이 안 바뀌었으면 I/O 없음)
 def load_level_cards(domain: str, level: int):
-    return _load_json(os.path.join(DATA_DIR, f"{domain}_L{level}.json"))
+    return repo.load_level(domain, level)
 
 def load_master(domain: str):
-    return _load_json(os.path.join(DATA_DIR, f"{domain}_master.json"))
-
-EN_FILES = {
-  "coding": "english_coding.json",
-  "pattern": "english_pattern.json",
-  "conversation": "english_conversation.json",
-  "vocab": "english_vocab.json"
-}
+    return repo.load_master(domain)
 
 def load_english(category: str):
-    fname = EN_FILES.get(category, "english_vocab.json")
-    candidates = [
-        os.path.join(DATA_DIR, fname),
-        os.path.join(DATA_DIR, "data", fname),
-    ]
-    for p in candidates:
-        if os.path.exists(p):
-            return _load_json(p)
-    return []
+    return repo.load_english(category)
 
-def ensure_page(cards, domain: str, want: int):
+# 부족분은 마스터에서 보충. 보충 카드의 id는 레벨 덱 뒤로 이어 붙임 (id = rows 안의 위치)
+def ensure_page(cards, domain: str, want: int, level: int | None = None):
     if len(cards) >= want: return cards[:want]
-    master = load_master(domain)
-    seen = {c.get("keyword") for c in cards}
-    extra = [c for c in master if c.get("keyword") not in seen]
-    return (cards + extra)[:want]
+    if level is not None:
+        extra = repo.master_extra(domain, level)        # 캐시된 마스터 차집합
+    else:
+        seen = {c.get("keyword") for c in cards}
+        extra = [c for c in load_master(domain) if c.get("keyword") not in seen]
+    n = len(cards)
+    return list(cards) + [dict(c, id=n + j) for j, c in enumerate(extra[:want - n])]
 
 def pick_round2(cards, page=PAGE_DEFAULT, seed=None):
     rng = random.Random(seed)
     k = min(page, len(cards))
     return rng.sample(cards, k=k) if k > 0 else []
 
-def pick_round3(cards, prev_ids: set, page=PAGE_DEFAULT, seed=None):
-    rng = random.Random(seed)
-    def dedup_keep_order(seq):
-        seen=set(); out=[]
-        for c in seq:
-            kw=c.get("keyword")
-            if kw and kw not in seen:
-                out.append(c); seen.add(kw)
-        return out
-    unseen = [c for c in cards if c.get("keyword") not in prev_ids]
-    pool = unseen[:]
-    if len(pool) < page:
-        rest = [c for c in cards if c not in pool]; rng.shuffle(rest); pool += rest
-    if len(pool) < page:
-        extra = cards * (page // max(1, len(cards)) + 1); rng.shuffle(extra); pool += extra
-    rng.shuffle(pool); pool = dedup_keep_order(pool)
-    core    = [c for c in pool if "core"    in (c.get("tags") or [])]
-    applied = [c for c in pool if "applied" in (c.get("tags") or [])]
-    taken = set((c.get("keyword") for c in core)) | set((c.get("keyword") for c in applied))
-    other = [c for c in pool if c.get("keyword") not in taken]
-    rng.shuffle(core); rng.shuffle(applied); rng.shuffle(other)
-    result=[]; seen=set()
-    def take(B, k):
-        nonlocal result, seen
-        for c in B:
-            kw=c.get("keyword")
-            if kw in seen: continue
-            result.append(c); seen.add(kw)
-            if len(result)>=k: break
-    take(core, min(10, page))
-    take(applied, min(20, page))
-    for c in pool:
-        if len(result)>=page: break
-        kw=c.get("keyword"); 
-        if kw in seen: continue
-        result.append(c); seen.add(kw)
-    if len(result)<page:
-        for c in cards:
-            if len(result)>=page: break
-            kw=c.get("keyword")
-            if kw in seen: continue
-            result.append(c); seen.add(kw)
-    return result[:page]
+# r3: core 10 → applied(합계 20까지) → 나머지. 덱 인덱스(태그 파티션)에서 O(k)로 뽑음
+def pick_round3(cards, prev_ids, page=PAGE_DEFAULT, seed=None):
+    ix = index_for(cards)
+    ids = sample_round3(ix, as_idset(prev_ids).below(ix.n), page, random.Random(seed))
+    return [cards[i] for i in ids]
 
 # English 전용: 항상 랜덤 + 세션 누적 중복 최소화
-def pick_english(cards, seen_ids: set, k: int, seed=None):
-    rng = random.Random(seed)
-    unseen = [c for c in cards if c.get("keyword") not in seen_ids]
-    take = min(k, len(unseen))
-    chosen = rng.sample(unseen, k=take) if take>0 else []
-    if len(chosen) < k:
-        rest_pool = [c for c in cards if c.get("keyword") not in {x.get('keyword') for x in chosen}]
-        if rest_pool:
-            chosen += rng.sample(rest_pool, k=min(k-len(chosen), len(rest_pool)))
-    return chosen[:k]
+def pick_english(cards, seen_ids, k: int, seed=None):
+    ix = index_for(cards)
+    ids = sample_english(ix, as_idset(seen_ids).below(ix.n), k, random.Random(seed))
+    return [cards[i] for i in ids]
+
+def deck_name(ctx) -> str:
+    return f"english_{ctx.category}" if ctx.domain == "english" else f"{ctx.domain}_L{ctx.level}"
+
+def mark_seen(ctx, grade: int = GRADE_SEEN):
+    """현재 카드를 본 것으로 표시 (세션 중복 회피 + 간격 반복 기록). 간격 반복은 회차의 같은 자리마다 한 번만 기록
+    (이전→다음, 마지막 카드에서 다음 연타가 복습 횟수를 올리지 않게)"""
+    c = ctx.cur_card()
+    if c.get("id") is not None: ctx.prev_ids.add(c["id"])
+    at = (ctx.round_no, ctx.idx)
+    if ctx.sched and at not in ctx.reviewed:
+        ctx.reviewed.add(at)
+        ctx.sched.review(card_key(c), grade)
+
+def pick_random_round(ctx, rows, seed, prev=None):
+    """r2/영어 회차: 간격 반복이 켜져 있으면 기한 지난 카드 우선, 아니면 기존 랜덤 규칙"""
+    prev = ctx.prev_ids if prev is None else prev
+    if ctx.sched:
+        keys = {card_key(rows[i]) for i in prev.below(len(rows))}
+        return ctx.sched.pick_due(rows, ctx.page, rng=random.Random(seed), exclude=keys)
+    if ctx.domain == "english":
+        return pick_english(rows, prev, ctx.page, seed)
+    return pick_round2(rows, page=ctx.page, seed=seed)
+
+def pick_round(ctx, n: int, rows, prev, seed):
+    """회차 규칙: r1 순차/섞기(영어는 랜덤), r2 랜덤, r3 core/applied 혼합(영어는 랜덤)"""
+    if ctx.domain == "english" or n == 2:
+        return pick_random_round(ctx, rows, seed, prev)
+    if n == 1:
+        return pick_round2(rows, page=ctx.page, seed=seed) if ctx.shuffle_r1 else rows[:ctx.page]
+    if ctx.sched: prev = prev | index_for(rows).ids_of(ctx.sched.resting(limit=len(rows) - ctx.page))
+    return pick_round3(rows, prev_ids=prev, page=ctx.page, seed=seed)
+
+def session_rows(ctx):
+    """세션 덱 (회차 내내 같은 리스트 → 같은 DeckIndex)"""
+    if ctx.domain == "english": return load_english(ctx.category)
+    rows = load_level_cards(ctx.domain, ctx.level)
+    return ensure_page(rows, ctx.domain, ctx.page, ctx.level) if ctx.fill else rows
+
+# 지난 세션 덱 → 다음 실행의 시작 화면 동안 미리 읽어 둠 (.fdk 팩이 있으면 mmap)
+LAST_SESSION = os.path.join(os.path.expanduser("~"), ".flash_learning", "desktop_last.json")
+
+def remember_session(ctx):
+    try:
+        os.makedirs(os.path.dirname(LAST_SESSION), exist_ok=True)
+        with open(LAST_SESSION, "w", encoding="utf-8") as f:
+            json.dump({"domain": ctx.domain, "category": ctx.category, "level": ctx.level, "fill": ctx.fill}, f)
+    except OSError:
+        pass
+
+def warm_decks():
+    """시작 화면 동안 백그라운드: 지난 세션 덱(없으면 기본 덱)을 repo 캐시/덱 인덱스에 올림"""
+    try:
+        with open(LAST_SESSION, encoding="utf-8") as f:
+            last = json.load(f)
+    except (OSError, ValueError):
+        last = {}
+    try:
+        domain = last.get("domain", "python")
+        if domain == "english":
+            index_for(load_english(last.get("category", "vocab")))
+        else:
+            level = int(last.get("level", 1))
+            load_level_cards(domain, level)
+            if last.get("fill", True): repo.master_extra(domain, level)
+    except Exception:
+        return
+    startup_mark("decks warm")
+
+def round_seed(ctx) -> int:
+    return int(time.time_ns() & 0xFFFFFFFF) if ctx.seed is None else ctx.seed
+
+class SessionPlan:
+    """세션 덱을 시작할 때 한 번 읽고 3회차 덱을 미리 뽑아 둠.
+    회차마다 '그 전까지 본 카드'를 가정해 두고, 실제와 다르면(중간에 멈춤 등) 또는 간격 반복처럼
+    앞 회차 기록에 따라 달라지면 휴식 화면 동안 prefetch() 가 백그라운드에서 다시 뽑는다."""
+    def __init__(self, ctx, rounds: int = 3):
+        self.ctx = ctx
+        self.rows = session_rows(ctx)
+        index_for(self.rows)                        # 태그 파티션/순서표는 세션에 한 번
+        self.seeds = {n: round_seed(ctx) for n in range(1, rounds + 1)}
+        self.ready: dict = {}                       # 회차 → (가정한 prev_ids, 덱)
+        self._jobs: dict = {}                       # 회차 → 백그라운드 스레드
+        prev = IdSet()
+        for n in self.seeds:
+            if ctx.sched and n > 1: break           # 간격 반복: 앞 회차 채점 뒤에 뽑아야 함
+            deck = pick_round(ctx, n, self.rows, prev, self.seeds[n])
+            self.ready[n] = (prev, deck)
+            prev = prev | IdSet(c["id"] for c in deck if c.get("id") is not None)
+
+    def _valid(self, n: int) -> bool:
+        r = self.ready.get(n)
+        return r is not None and r[0] == self.ctx.prev_ids
+
+    def _pick(self, n: int, prev):
+        self.ready[n] = (prev, pick_round(self.ctx, n, self.rows, prev, self.seeds[n]))
+
+    def prefetch(self, n: int):
+        """휴식 화면 시작 때: n 회차 덱이 아직 유효하지 않으면 백그라운드에서 뽑기 시작"""
+        if n not in self.seeds or n in self._jobs or self._valid(n): return
+        t = threading.Thread(target=self._pick, args=(n, self.ctx.prev_ids.copy()), name=f"flash-plan-r{n}", daemon=True)
+        self._jobs[n] = t; t.start()
+
+    def deck(self, n: int) -> list:
+        t = self._jobs.pop(n, None)
+        if t is not None: t.join()
+        if not self._valid(n): self._pick(n, self.ctx.prev_ids.copy())
+        return self.ready[n][1]
 
 class Ctx:
     def __init__(self):
@@ -227,10 +300,15 @@ class Ctx:
         self.start_page=0
         self.seed=None
         self.fill=True
+        self.srs=False            # 간격 반복 사용 여부
+        self.sched=None           # 세션 시작 시 Scheduler.open(...)
+        self.plan=None            # SessionPlan (회차 덱 미리 뽑기)
 
         self.deck=[]
         self.idx=0
-        self.prev_ids=set()
+        self.prev_ids=IdSet()     # 이번 세션에 본 카드 id
+        self.reviewed=set()       # 간격 반복에 기록한 (회차, 인덱스)
+        self.view=None            # 학습 창의 CardView (바뀐 필드만 다시 그림)
 
         self.kw_font=36
         self.interval=1.2
@@ -239,9 +317,7 @@ class Ctx:
         self.fullscreen=False
         self.focus=False
                 # TTS
-        self.tts_engine = tts_init()                 # (엔진 인스턴스)
-        self.voice_en   = tts_pick_voice(self.tts_engine, "en") if self.tts_engine else None
-        self.voice_ko   = tts_pick_voice(self.tts_engine, "ko") if self.tts_engine else None
+        self.speech     = SpeechWorker(tts_open)     # (엔진 생성·보이스 검색·재생 모두 작업 스레드에서)
         self.auto_tts   = True                       # (자동 읽기 여부)
         self.last_spoken = (-1, -1)                  # (라운드, 카드 인덱스) 중복 읽기 방지
 
@@ -250,6 +326,10 @@ class Ctx:
         self.session_mode=False
         self.start_time=None
         self.total_seconds=0
+        self.rest_left=0; self.rest_t0=0.0     # 휴식 남은 초 / 시작 시각 (monotonic)
+        self.breath=None                       # BreathView (휴식 화면 호흡 원)
+        self.tones=None                        # TonePlayer (첫 휴식 때 생성)
+        self.out_left=0                        # OUTPUT 남은 초
 
         self.shuffle_r1=True
 
@@ -277,22 +357,68 @@ def graph_box(key: str, w: int, h: int, bg="#111"):
                     background_color=bg,
                     key=key, enable_events=False)
 
-def graph_center_text(graph: sg.Graph, text: str, font, color=TEXT_COLOR):
-    w, h = graph.CanvasSize
-    graph.erase()
-    graph.draw_text(text or "", (w/2, h/2), color=color, font=font)
-
-def graph_center_multiline(graph: sg.Graph, text: str, font, color=TEXT_COLOR):
-    w, h = graph.CanvasSize
-    graph.erase()
-    lines = (text or "").split("\n")
-    try: fsize = int(font[1])
-    except: fsize = 20
-    line_h = int(fsize * 1.25)
-    total_h = line_h * max(1, len(lines))
-    y0 = (h - total_h) / 2 + line_h/2
-    for i, ln in enumerate(lines):
-        graph.draw_text(ln, (w/2, y0 + i*line_h), color=color, font=font)
+def canvas_xy(graph: sg.Graph, x: float, y: float):
+    """graph 좌표 → Tk 캔버스 좌표. graph_box 는 좌하단 (0,0), 우상단 = 캔버스 크기라 y 만 뒤집힘
+    (크기를 바꿀 때도 apply_card_metrics 가 좌표계를 같이 맞춤)"""
+    return x, graph.CanvasSize[1] - y
+
+_TEXT_METRICS = None
+
+def text_metrics(graph: sg.Graph) -> TkMetrics:
+    """폰트 측정기 (창이 하나라 프로세스에 하나)"""
+    global _TEXT_METRICS
+    if _TEXT_METRICS is None: _TEXT_METRICS = TkMetrics(graph.TKCanvas)
+    return _TEXT_METRICS
+
+class GraphText:
+    """Graph 하나의 가운데 정렬 텍스트. 박스에 맞춰 글자 크기/줄바꿈을 정하고(flash_textfit, 캐시),
+    figure id 를 유지한 채 바뀐 것만 고침 (erase/다시 그리기 없음)"""
+    def __init__(self, graph: sg.Graph, color=TEXT_COLOR):
+        self.graph, self.color = graph, color
+        self.figs: list = []
+        self.lines: list = []
+        self.font = None                # 실제로 쓴 폰트 (맞춤 후)
+        self.box = None                 # 배치할 때의 캔버스 크기
+        self.want = None                # 마지막 요청 (텍스트, 폰트, 박스)
+
+    def set(self, text: str, font) -> bool:
+        """바뀐 게 없으면 아무것도 안 하고 False"""
+        g = self.graph
+        w, h = g.CanvasSize
+        want = (text or "", font, (w, h))
+        if want == self.want: return False
+        self.want = want
+        lay = fit(text or "", font, (w, h), text_metrics(g))
+        lines = list(lay.lines)
+        cv = g.TKCanvas
+        relayout = len(lines) != len(self.lines) or lay.font != self.font or (w, h) != self.box
+        y0 = h/2 + (len(lines) - 1) * lay.line_h / 2      # 첫 줄이 위 (좌표는 아래가 0)
+        while len(self.figs) < len(lines):
+            self.figs.append(g.draw_text("", (w/2, h/2), color=self.color, font=lay.font))
+        while len(self.figs) > len(lines):
+            g.delete_figure(self.figs.pop())
+        for i, (fid, ln) in enumerate(zip(self.figs, lines)):
+            if relayout:
+                cv.coords(fid, *canvas_xy(g, w/2, y0 - i*lay.line_h))
+                cv.itemconfig(fid, font=lay.font)
+            if i >= len(self.lines) or self.lines[i] != ln:
+                cv.itemconfig(fid, text=ln)
+        self.lines, self.font, self.box = lines, lay.font, (w, h)
+        return True
+
+class CardView:
+    """학습 창 하나에 대해 마지막으로 그린 상태 (창을 새로 만들면 새 CardView)"""
+    def __init__(self, win):
+        self.win = win
+        self.kw    = GraphText(win["-GKW-"])
+        self.mean  = GraphText(win["-GMEAN-"])
+        self.usage = GraphText(win["-GUSAGE-"])
+        self.progress = None
+
+    def invalidate(self):
+        """캔버스 크기가 바뀜 → 다음 render_card 에서 줄 위치를 다시 잡음"""
+        for t in (self.kw, self.mean, self.usage): t.want = t.font = None
+        self.progress = None
 
 def layout_splash():
     return [
@@ -341,6 +467,7 @@ def layout_select(ctx: Ctx):
             [sg.Text("한 회차 장수"), sg.Spin([i for i in range(10,61,5)], initial_value=ctx.page, key="-PAGE-", size=(6,1))],
             [sg.Text("seed(선택)"), sg.Input("" if ctx.seed is None else str(ctx.seed), key="-SEED-", size=(12,1))],
             [sg.Text("영어는 항상 랜덤·중복 최소화로 동작합니다.", text_color="#aaaaaa")],
+            [sg.Checkbox("간격 반복(복습 기한 우선)", default=ctx.srs, key="-SRS-")],
         ]
     else:
         body = [
@@ -350,6 +477,7 @@ def layout_select(ctx: Ctx):
             [sg.Text("seed(선택)"), sg.Input("" if ctx.seed is None else str(ctx.seed), key="-SEED-", size=(12,1))],
             [sg.Checkbox("레벨 부족 시 마스터로 보충", default=ctx.fill, key="-FILL-")],
             [sg.Checkbox("r1도 랜덤 섞기", default=ctx.shuffle_r1, key="-SHUF_R1-")],
+            [sg.Checkbox("간격 반복(복습 기한 우선)", default=ctx.srs, key="-SRS-")],
         ]
 
     return [[sg.Column([
@@ -388,6 +516,7 @@ def layout_study(ctx: Ctx):
          sg.Button("🔊 EN", key="-SAY_EN-"),
          sg.Button("🔊 KO", key="-SAY_KO-"),
          sg.Checkbox("자동 읽기", default=ctx.auto_tts, key="-AUTO_TTS-"),
+         sg.Button("다시(↓)", key="-AGAIN-", visible=ctx.srs),
 ]
          
     ], key="-CTRL-ROW-", visible=not ctx.fullscreen, pad=(0,6))
@@ -417,12 +546,14 @@ def layout_rest(ctx: Ctx, seconds: int):
         [sg.Button("건너뛰기", key="-SKIP-")],
     ]
 
-def layout_summary(ctx: Ctx):
+def summary_label(ctx: Ctx) -> str:
     mm = int(ctx.total_seconds // 60); ss = int(ctx.total_seconds % 60)
-    label = f"{ctx.domain.upper()}·{(ctx.category if ctx.domain=='english' else 'L'+str(ctx.level))} / 30×3회 / 총 {mm}분 {ss}초"
+    return f"{ctx.domain.upper()}·{(ctx.category if ctx.domain=='english' else 'L'+str(ctx.level))} / 30×3회 / 총 {mm}분 {ss}초"
+
+def layout_summary(ctx: Ctx):
     return [
         [sg.Text("오늘의 학습 요약", font=("Segoe UI", 18, "bold"))],
-        [sg.Text(label)],
+        [sg.Text(summary_label(ctx), key="-SUMMARY-", size=(48,1))],
         [sg.Button("OUTPUT 모드로", key="-TO_OUTPUT-", size=(14,1)),
          sg.Button("메인으로", key="-TO_HOME-", size=(14,1))],
     ]
@@ -453,32 +584,136 @@ def layout_output_write():
         [sg.Button("제출/저장", key="-SAVE-"), sg.Button("다음", key="-OUT_DONE-"), sg.Button("메인으로", key="-TO_HOME-")],
     ]
 
-def make_window(ctx: Ctx):
-    pages = {
-        "splash":       lambda: sg.Window(TITLE, layout_splash(),     finalize=True, return_keyboard_events=True),
-        "home":         lambda: sg.Window(TITLE, layout_home(),       finalize=True, return_keyboard_events=True),
-        "select":       lambda: sg.Window(TITLE, layout_select(ctx),  finalize=True, return_keyboard_events=True),
-        "loop":         lambda: sg.Window(TITLE, layout_loopinfo(ctx),finalize=True, return_keyboard_events=True),
-        "study":        lambda: sg.Window(TITLE, layout_study(ctx),   finalize=True, return_keyboard_events=True, resizable=True),
-        "rest":         lambda: sg.Window("Meditation", layout_rest(ctx, ctx.rest), finalize=True, return_keyboard_events=True, modal=True, keep_on_top=True),
-        "summary":      lambda: sg.Window(TITLE, layout_summary(ctx), finalize=True, return_keyboard_events=True),
-        "output_menu":  lambda: sg.Window(TITLE, layout_output_menu(),finalize=True, return_keyboard_events=True),
-        "output_say":   lambda: sg.Window(TITLE, layout_output_say(), finalize=True, return_keyboard_events=True),
-        "output_write": lambda: sg.Window(TITLE, layout_output_write(),finalize=True, return_keyboard_events=True),
-        "manual":       lambda: sg.Window(TITLE, [[sg.Text("메뉴얼은 추후 보강")]], finalize=True, return_keyboard_events=True),
-        "settings":     lambda: sg.Window(TITLE, [[sg.Text("설정은 홈에서 조정")]], finalize=True, return_keyboard_events=True),
-    }
-    return pages.get(ctx.state, lambda: sg.Window(TITLE, [[sg.Text("state error")]], finalize=True))()
-
-def update_progress(win, ctx: Ctx):
+# --------- 화면 패널 (창 하나, 상태 전환 = 패널 보이기/숨기기) ---------
+PANES = {
+    "splash":       lambda ctx: layout_splash(),
+    "home":         lambda ctx: layout_home(),
+    "select":       layout_select,
+    "loop":         layout_loopinfo,
+    "study":        layout_study,
+    "rest":         lambda ctx: layout_rest(ctx, ctx.rest),
+    "summary":      layout_summary,
+    "output_menu":  lambda ctx: layout_output_menu(),
+    "output_say":   lambda ctx: layout_output_say(),
+    "output_write": lambda ctx: layout_output_write(),
+    "manual":       lambda ctx: [[sg.Text("메뉴얼은 추후 보강")]],
+    "settings":     lambda ctx: [[sg.Text("설정은 홈에서 조정")]],
+}
+
+def _scope_keys(rows, pid: str):
+    """패널마다 같은 키(-TO_HOME- 등)를 쓰므로 창 안에서는 (패널 id, 키) 로 바꿔 둠"""
+    for row in rows:
+        for el in row:
+            if el.Key is not None: el.Key = (pid, el.Key)
+            if getattr(el, "Rows", None): _scope_keys(el.Rows, pid)
+
+class Screens:
+    """창 하나에 화면별 패널을 쌓아 두고 보이기/숨기기만 바꿈.
+    패널은 처음 보여줄 때 한 번 만들고, 이후엔 ctx 에 따라 바뀌는 값만 refresh.
+    read()/[] 는 지금 패널 기준 (이벤트·values 키에서 패널 id 를 떼어 돌려줌) → 기존 상태 처리 코드 그대로"""
+    def __init__(self):
+        self.win = sg.Window(TITLE, [[]], finalize=True, return_keyboard_events=True, resizable=True)
+        self.panes: dict = {}          # 패널 id → Column
+        self.pid = None                # 보이는 패널
+        self.metrics = None            # study 패널에 적용한 카드 크기
+
+    @staticmethod
+    def pane_id(ctx) -> str:
+        if ctx.state == "select":      # 도메인에 따라 입력 칸이 다름 → 두 벌
+            return "select:english" if ctx.domain == "english" else "select:other"
+        return ctx.state if ctx.state in PANES else "manual"
+
+    def show(self, ctx):
+        if ctx.state != "study": ctx.speech.cancel()     # 학습 화면을 떠나면 남은 발화 버림
+        pid = self.pane_id(ctx)
+        if pid not in self.panes:
+            rows = PANES[pid.split(":")[0]](ctx)
+            _scope_keys(rows, pid)
+            pane = self.panes[pid] = sg.Column(rows, key=(pid, "-PANE-"), pad=(0, 0), visible=False)
+            self.win.extend_layout(self.win, [[pane]])
+        if pid != self.pid:
+            if self.pid is not None: self.panes[self.pid].update(visible=False)
+            self.panes[pid].update(visible=True)
+            self.pid = pid
+            self.win.set_title("Meditation" if ctx.state == "rest" else TITLE)
+        refresh_pane(self, ctx)
+        return self
+
+    def __getitem__(self, key):
+        return self.win[(self.pid, key)]
+
+    def read(self, timeout=None):
+        event, values = self.win.read(timeout=timeout)
+        if isinstance(event, tuple): event = event[1]
+        if values is not None:
+            values = {k[1]: v for k, v in values.items() if isinstance(k, tuple) and k[0] == self.pid}
+        return event, values
+
+    def refresh(self):
+        self.win.refresh()
+
+    def close(self):
+        self.win.close()
+
+def reopen(ctx) -> Screens:
+    """창이 닫혔을 때 새 창 (닫힌 창에 묶인 카드 뷰/호흡 원/폰트 측정기는 버림)"""
+    global _TEXT_METRICS
+    _TEXT_METRICS = None
+    ctx.view = ctx.breath = None
+    return Screens()
+
+def apply_card_metrics(win: Screens, ctx: Ctx):
+    """study 패널의 캔버스 크기/컨트롤 표시를 제자리에서 맞춤 (F11)"""
+    m = (ctx.card_w, ctx.key_h, ctx.mean_h, ctx.usage_h, ctx.fullscreen)
+    if win.metrics == m: return
+    win.metrics = m
+    for key, h in (("-GKW-", ctx.key_h), ("-GMEAN-", ctx.mean_h), ("-GUSAGE-", ctx.usage_h)):
+        g = win[key]
+        g.set_size((ctx.card_w, h)); g.change_coordinates((0, 0), (ctx.card_w, h))
+    safe_update(win, "-CTRL-ROW-", visible=not ctx.fullscreen)
+    safe_update(win, "-BTN-ROW-",  visible=not ctx.fullscreen)
+    safe_update(win, "-FULL-",     visible=not ctx.fullscreen)
+    safe_update(win, "-FS-HELP-",  visible=ctx.fullscreen)
+    if ctx.view is not None: ctx.view.invalidate()
+
+def refresh_pane(win: Screens, ctx: Ctx):
+    """패널을 다시 보여줄 때 ctx 에서 오는 값만 갱신 (만들 때 layout_* 가 넣던 값)"""
+    st = ctx.state
+    if st == "select":
+        safe_update(win, "-DOMAIN-", value=ctx.domain)
+    elif st == "study":
+        apply_card_metrics(win, ctx)
+        safe_update(win, "-KW_SIZE-",  value=ctx.kw_font)
+        safe_update(win, "-AUTOSEC-",  value=ctx.interval)
+        safe_update(win, "-AUTO_TTS-", value=ctx.auto_tts)
+        safe_update(win, "-AGAIN-",    visible=ctx.srs)
+        if ctx.view is not None: ctx.view.progress = None
+    elif st == "rest":
+        safe_update(win, "-REST-LEFT-", f"남은 시간: {ctx.rest}초")
+    elif st == "summary":
+        safe_update(win, "-SUMMARY-", summary_label(ctx))
+    elif st == "output_say":
+        safe_update(win, "-TIMER-", "00:30")
+    elif st == "output_write":
+        safe_update(win, "-TIMER-", "01:00"); safe_update(win, "-WRITE-", "")
+
+def update_progress(win, ctx: Ctx, view: CardView | None = None):
     t = len(ctx.deck); cur = ctx.idx + 1 if t else 0
     pct = int(cur / t * 100) if t else 0
+    state = (cur, t, ctx.round_no, ctx.domain, ctx.category, ctx.level)
+    if view is not None:
+        if view.progress == state: return
+        view.progress = state
     safe_update(win, "-PROG-", pct)
     safe_update(win, "-PROG_TXT-", f"{cur}/{t} ({pct}%)")
     label = f"{ctx.domain.upper()} · {(ctx.category if ctx.domain=='english' else 'L'+str(ctx.level))} · {ctx.round_no}/3 · {cur}/{t}"
     safe_update(win, "-STATE-", label)
 
 def render_card(win, ctx: Ctx):
+    """바뀐 필드만 갱신 (매 틱 불려도 카드/폰트/진행률이 그대로면 캔버스를 건드리지 않음)"""
+    view = ctx.view
+    if view is None or view.win is not win:
+        view = ctx.view = CardView(win)
     c = ctx.cur_card()
     scale = ctx.font_scale
     kw_size    = int(ctx.kw_font * scale)
@@ -488,39 +723,59 @@ def render_card(win, ctx: Ctx):
     mean_font  = ("Segoe UI", mean_size, "bold")
     usage_font = ("Consolas", usage_size)
         # --- 자동 읽기: 같은 카드/라운드에서 중복 발화 방지 ---
-    if ctx.auto_tts and (ctx.round_no, ctx.idx) != ctx.last_spoken:
-        speak_en(ctx)
-        # KO는 살짝 텀을 두고
-        def later():
-            speak_ko(ctx)
-        threading.Timer(0.25, later).start()
+    if (ctx.round_no, ctx.idx) != ctx.last_spoken:
+        ctx.speech.retarget((ctx.round_no, ctx.idx))    # 지난 카드의 대기/재생 중 발화 취소
+        if ctx.auto_tts:
+            speak_en(ctx)
+            speak_ko(ctx, delay=0.25)                   # KO는 살짝 텀을 두고 (EN 뒤에 큐)
         ctx.last_spoken = (ctx.round_no, ctx.idx)
 
     if not c:
-        graph_center_text(win["-GKW-"],   "카드가 없습니다.", kw_font)
-        graph_center_text(win["-GMEAN-"], "",               mean_font)
-        graph_center_text(win["-GUSAGE-"],"",               usage_font)
-        update_progress(win, ctx); return
+        view.kw.set(   "카드가 없습니다.", kw_font)
+        view.mean.set( "",               mean_font)
+        view.usage.set("",               usage_font)
+        update_progress(win, ctx, view); return
 
-    graph_center_text(win["-GKW-"],   c.get("keyword",""),            kw_font)
-    graph_center_text(win["-GMEAN-"], (c.get("meaning","") or ""), mean_font)
+    view.kw.set(  c.get("keyword",""),            kw_font)
+    view.mean.set((c.get("meaning","") or ""), mean_font)
 
     if c.get("category") == "pattern" and c.get("items"):
         lines = [f"• {it.get('en','')} / {it.get('ko','')}" for it in c["items"]][:16]
         txt = "\n".join(lines)
     else:
         txt = c.get("usage_one_liner","")
-    graph_center_multiline(win["-GUSAGE-"], txt, usage_font)
-    update_progress(win, ctx)
+    view.usage.set(txt, usage_font)
+    update_progress(win, ctx, view)
 
 def toggle_full(win, ctx: Ctx):
     ctx.fullscreen = not ctx.fullscreen
     set_card_metrics(ctx, ctx.fullscreen)
-    win.close()
-    win = make_window(ctx)
-    if ctx.state == "study": render_card(win, ctx)
+    if ctx.state == "study":                    # 다른 화면이면 study 패널을 다시 보여줄 때 맞춤
+        apply_card_metrics(win, ctx); render_card(win, ctx)
     return win
 
+def next_phase_in(t_in_cycle: float) -> float:
+    """다음 호흡 단계 경계까지 남은 초"""
+    for b in (INHALE_S, INHALE_S + HOLD_S, CYCLE_S):
+        if t_in_cycle < b: return b - t_in_cycle
+    return CYCLE_S - t_in_cycle
+
+def start_timers(ctx, clock: Deadlines):
+    """화면이 바뀔 때: 이전 화면의 타이머를 지우고 이 화면의 첫 마감을 넣음"""
+    clock.cancel(*TIMERS)
+    if ctx.state == "study" and ctx.auto:
+        clock.after(T_AUTO, ctx.interval)
+    elif ctx.state == "rest":
+        ctx.plan.prefetch(ctx.round_no + 1)            # 다음 회차 덱은 명상 동안 준비
+        ctx.rest_left, ctx.rest_t0 = ctx.rest, clock.clock()
+        if ctx.tones is None:
+            ctx.tones = tone_player({**{k: [(hz, 120)] for k, hz in BEEP_HZ.items()},
+                                     "end": [(hz, 120) for hz in BEEP_HZ.values()]})
+        clock.after(T_REST, 1.0); clock.at(T_PHASE, ctx.rest_t0); clock.at(T_BREATH, ctx.rest_t0)
+    elif ctx.state in ("output_say", "output_write"):
+        ctx.out_left = 30 if ctx.state == "output_say" else 60
+        clock.after(T_OUT, 1.0)
+
 def breath_phase(t_in_cycle: float):
     if t_in_cycle < INHALE_S: return "들이마시기", t_in_cycle / INHALE_S
     t_in_cycle -= INHALE_S
@@ -529,26 +784,70 @@ def breath_phase(t_in_cycle: float):
     if t_in_cycle < EXHALE_S: return "내쉬기", 1.0 - (t_in_cycle / EXHALE_S)
     return "들이마시기", 0.0
 
-def draw_breath(graph: sg.Graph, phase: str, ratio: float):
-    graph.erase()
-    w, h = graph.CanvasSize
-    cx, cy = w//2, h//2
-    r_min, r_max = 30, 110
-    r = int(r_min + (r_max - r_min) * max(0.0, min(1.0, ratio)))
-    color = {"들이마시기":"#7fdcff","멈춤":"#a0ffa0","내쉬기":"#ffd07f"}.get(phase, "#ffffff")
-    graph.draw_circle((cx, cy), r, fill_color=color, line_color="#333333")
-    graph.draw_text(phase, (cx, cy), color="#000000", font=("Segoe UI", 14, "bold"))
+_BREATH_TABLE = None
+
+def breath_table():
+    """한 주기의 프레임 표 (BREATH_FRAME_S 간격): [(반지름, 색, 단계)], [다음으로 모양이 바뀌는 프레임까지 칸 수]"""
+    global _BREATH_TABLE
+    if _BREATH_TABLE is None:
+        n = int(round(CYCLE_S / BREATH_FRAME_S))
+        r_min, r_max = BREATH_R
+        frames = []
+        for i in range(n):
+            phase, ratio = breath_phase(i * BREATH_FRAME_S)
+            frames.append((int(r_min + (r_max - r_min) * max(0.0, min(1.0, ratio))), BREATH_COLORS.get(phase, "#ffffff"), phase))
+        steps = []
+        for i in range(n):
+            k = 1
+            while k < n and frames[(i + k) % n] == frames[i]: k += 1
+            steps.append(k)
+        _BREATH_TABLE = (frames, steps)
+    return _BREATH_TABLE
+
+class BreathView:
+    """호흡 원/라벨 figure 를 한 번 만들고, 프레임마다 바뀐 좌표·색·글자만 고침 (erase 없음)"""
+    def __init__(self, graph: sg.Graph):
+        self.graph = graph
+        w, h = graph.CanvasSize
+        self.cx, self.cy = w//2, h//2
+        self.circle = graph.draw_circle((self.cx, self.cy), BREATH_R[0], fill_color="#ffffff", line_color="#333333")
+        self.label  = graph.draw_text("", (self.cx, self.cy), color="#000000", font=("Segoe UI", 14, "bold"))
+        self.frame = (None, None, None)
+
+    def show(self, frame):
+        if frame == self.frame: return
+        (r, color, phase), (r0, color0, phase0) = frame, self.frame
+        cv = self.graph.TKCanvas
+        if r != r0:
+            x, y = canvas_xy(self.graph, self.cx, self.cy)
+            cv.coords(self.circle, x - r, y - r, x + r, y + r)
+        if color != color0: cv.itemconfig(self.circle, fill=color)
+        if phase != phase0: cv.itemconfig(self.label, text=phase)
+        self.frame = frame
 
 def main():
     ctx = Ctx()
-    win = make_window(ctx)
-    last_tick = time.time()
+    startup_mark("ctx")
+    win = Screens().show(ctx)
+    win.refresh()
+    startup_mark("first frame")                     # 시작 화면이 그려진 시점
+    threading.Thread(target=warm_decks, name="flash-warm", daemon=True).start()
+    clock = Deadlines()
+    shown = None
+    prof = flash_profile.profiler("desktop")       # 꺼져 있으면 NULL (빈 호출)
 
     while True:
-        timeout = 50 if (ctx.state == "study" and ctx.auto) else 400
-        event, values = win.read(timeout=timeout)
-
-        if event in (sg.WIN_CLOSED, "-EXIT-") and ctx.state != "rest":
+        prof.end()                                  # 이전 이벤트 처리 끝 (continue 포함)
+        if ctx.state != shown:
+            start_timers(ctx, clock); shown = ctx.state
+        event, values = win.read(timeout=clock.timeout_ms())   # 다음 마감까지만 (없으면 이벤트가 올 때까지)
+        if event == sg.TIMEOUT_KEY:
+            event = clock.pop_due() or event
+        prof.begin(f"{ctx.state}:{event}")          # 대기 시간은 빼고 이벤트 처리만
+
+        if event == sg.WIN_CLOSED and ctx.state == "rest":
+            win = reopen(ctx); event = "-SKIP-"           # 예전처럼 휴식 중 창 닫기 = 휴식 건너뛰기 (다음 회차는 새 창에서)
+        elif event in (sg.WIN_CLOSED, "-EXIT-"):
             break
 
         if event in ("F11","F11:122") and ctx.state in {"study","home","select","loop","summary","output_menu"}:
@@ -559,14 +858,14 @@ def main():
         # splash
         if ctx.state == "splash":
             if event in ("-TO_HOME-","space","space:32"):
-                win.close(); ctx.state="home"; win = make_window(ctx)
+                ctx.state="home"; win.show(ctx)
 
         # home
         elif ctx.state == "home":
             if event == "-TO_SELECT-":
-                win.close(); ctx.state="select"; win = make_window(ctx)
+                ctx.state="select"; win.show(ctx)
             elif event == "-TO_OUTPUT-":
-                win.close(); ctx.state="output_menu"; win = make_window(ctx)
+                ctx.state="output_menu"; win.show(ctx)
             elif event == "-TO_MANUAL-":
                 sg.popup_ok("메뉴얼은 추후 보강", keep_on_top=True)
             elif event == "-TO_SETTINGS-":
@@ -579,15 +878,16 @@ def main():
                 # 도메인 바뀌면 카테고리/레벨 UI도 즉시 갱신
                 if ctx.domain != "english":
                     ctx.category = "vocab"
-                win.close(); win = make_window(ctx); continue
+                win.show(ctx); continue
 
             if event == "-BACK_HOME-":
-                win.close(); ctx.state="home"; win = make_window(ctx)
+                ctx.state="home"; win.show(ctx)
 
             elif event == "-TO_LOOP-":
                 ctx.domain = values.get("-DOMAIN-", ctx.domain)
                 seed_str   = str(values.get("-SEED-","")).strip()
                 ctx.seed   = int(seed_str) if seed_str.isdigit() else None
+                ctx.srs    = bool(values.get("-SRS-", ctx.srs))
 
                 if ctx.domain == "english":
                     ctx.category = values.get("-CAT-", ctx.category or "vocab")
@@ -599,49 +899,30 @@ def main():
                     ctx.fill       = bool(values.get("-FILL_",  values.get("-FILL-",  ctx.fill)))
                     ctx.shuffle_r1 = bool(values.get("-SHUF_R1_", values.get("-SHUF_R1-", ctx.shuffle_r1)))
 
-                win.close(); ctx.state="loop"; win = make_window(ctx)
+                ctx.state="loop"; win.show(ctx)
 
         # loop
         elif ctx.state == "loop":
             if event == "-BACK_SELECT-":
-                win.close(); ctx.state="select"; win = make_window(ctx)
+                ctx.state="select"; win.show(ctx)
 
             elif event == "-START_R1-":
-                ctx.session_mode=False; ctx.round_no=1; ctx.prev_ids=set()
-                if ctx.domain == "english":
-                    rows = load_english(ctx.category)
-                    dyn_seed = int(time.time_ns() & 0xFFFFFFFF) if ctx.seed is None else ctx.seed
-                    ctx.deck = pick_english(rows, ctx.prev_ids, ctx.page, dyn_seed)
-                else:
-                    if ctx.shuffle_r1:
-                        rows = load_level_cards(ctx.domain, ctx.level)
-                        if ctx.fill: rows = ensure_page(rows, ctx.domain, ctx.page)
-                        dyn_seed = int(time.time_ns() & 0xFFFFFFFF) if ctx.seed is None else ctx.seed
-                        ctx.deck = pick_round2(rows, page=ctx.page, seed=dyn_seed)
-                    else:
-                        rows = load_level_cards(ctx.domain, ctx.level)
-                        if ctx.fill: rows = ensure_page(rows, ctx.domain, ctx.page)
-                        ctx.deck = rows[:ctx.page]
+                ctx.session_mode=False; ctx.round_no=1; ctx.prev_ids=IdSet(); ctx.reviewed=set()
+                ctx.sched = Scheduler.open("local", deck_name(ctx)) if ctx.srs else None
+                ctx.plan = SessionPlan(ctx, rounds=1); remember_session(ctx)
+                ctx.deck = ctx.plan.deck(1)
                 ctx.idx=0; ctx.auto=False
-                win.close(); ctx.state="study"; win = make_window(ctx); render_card(win, ctx)
+                ctx.state="study"; win.show(ctx); render_card(win, ctx)
 
             elif event == "-START_SESSION-":
-                ctx.session_mode=True; ctx.round_no=1; ctx.prev_ids=set()
-                if ctx.domain == "english":
-                    rows = load_english(ctx.category)
-                    dyn_seed = int(time.time_ns() & 0xFFFFFFFF) if ctx.seed is None else ctx.seed
-                    ctx.deck = pick_english(rows, ctx.prev_ids, ctx.page, dyn_seed)
-                else:
-                    rows = load_level_cards(ctx.domain, ctx.level)
-                    if ctx.fill: rows = ensure_page(rows, ctx.domain, ctx.page)
-                    if ctx.shuffle_r1:
-                        dyn_seed = int(time.time_ns() & 0xFFFFFFFF) if ctx.seed is None else ctx.seed
-                        ctx.deck = pick_round2(rows, page=ctx.page, seed=dyn_seed)
-                    else:
-                        ctx.deck = rows[:ctx.page]
+                ctx.session_mode=True; ctx.round_no=1; ctx.prev_ids=IdSet(); ctx.reviewed=set()
+                ctx.sched = Scheduler.open("local", deck_name(ctx)) if ctx.srs else None
+                ctx.plan = SessionPlan(ctx)                 # 3회차 덱을 한 번에 (간격 반복이면 r1만)
+                remember_session(ctx)
+                ctx.deck = ctx.plan.deck(1)
                 ctx.idx=0; ctx.auto=True; ctx.interval=1.2
                 ctx.start_time=time.time()
-                win.close(); ctx.state="study"; win = make_window(ctx); render_card(win, ctx)
+                ctx.state="study"; win.show(ctx); render_card(win, ctx)
 
         # study
         elif ctx.state == "study":
@@ -666,128 +947,99 @@ def main():
             except Exception:
                 pass
 
-            if event in ("-NEXT-","Right","Right:39"):
+            if event in ("-NEXT-","Right","Right:39","-AGAIN-","Down","Down:40") and ctx.deck:
+                grade = GRADE_AGAIN if event in ("-AGAIN-","Down","Down:40") else GRADE_SEEN
                 if ctx.idx < len(ctx.deck)-1:
-                    ctx.prev_ids.add(ctx.cur_card().get("keyword","")); ctx.idx += 1; render_card(win, ctx)
+                    mark_seen(ctx, grade); ctx.idx += 1; render_card(win, ctx)
+                elif ctx.session_mode:
+                    mark_seen(ctx, grade)
+                    ctx.state="rest"; win.show(ctx)
                 else:
-                    ctx.prev_ids.add(ctx.cur_card().get("keyword",""))
-                    if ctx.session_mode:
-                        win.close(); ctx.state="rest"; win = make_window(ctx)
+                    mark_seen(ctx, grade)                   # 마지막 카드: 다시 눌러도 기록은 한 번 (mark_seen)
 
             if event in ("-PREV-","Left","Left:37"):
                 ctx.idx = max(0, ctx.idx-1); render_card(win, ctx)
+                if ctx.auto and not clock.pending(T_AUTO): clock.after(T_AUTO, ctx.interval)
 
             if event in ("-AUTO-","space","space:32"):
-                ctx.auto = not ctx.auto; last_tick = time.time()
+                ctx.auto = not ctx.auto
+                if ctx.auto: clock.after(T_AUTO, ctx.interval)
+                else:        clock.cancel(T_AUTO)
 
-            if ctx.auto and ctx.deck and (time.time() - last_tick >= ctx.interval):
-                last_tick = time.time()
+            if event == T_AUTO and ctx.auto and ctx.deck:
                 if ctx.idx < len(ctx.deck)-1:
-                    ctx.prev_ids.add(ctx.cur_card().get("keyword","")); ctx.idx += 1; render_card(win, ctx)
+                    mark_seen(ctx); ctx.idx += 1; render_card(win, ctx)
+                    clock.again(T_AUTO, ctx.interval)       # 밀리지 않는 주기
                 else:
-                    ctx.prev_ids.add(ctx.cur_card().get("keyword",""))
+                    mark_seen(ctx)                          # 마지막 카드: 세션이면 휴식, 아니면 여기서 멈춤 (이전으로 가면 다시)
                     if ctx.session_mode:
-                        win.close(); ctx.state="rest"; win = make_window(ctx)
+                        ctx.state="rest"; win.show(ctx)
 
             if ctx.state == "study":
                 render_card(win, ctx)
 
         # rest
         elif ctx.state == "rest":
-            left = ctx.rest; base = time.time()
-            g: sg.Graph = win["-GBREATH-"]; last_phase=None
-            while True:
-                ev,_ = win.read(timeout=50)
-                if ev in (sg.WIN_CLOSED, "-SKIP-"):
-                    break
-                now = time.time()
-                t_in = (now % CYCLE_S)
-                phase, ratio = breath_phase(t_in)
-                if phase != last_phase:
-                    try:
-                        if winsound:
-                            f = 880 if phase == "들이마시기" else 700 if phase == "멈춤" else 550
-                            winsound.Beep(f, 120)
-                    except Exception:
-                        pass
-                    last_phase = phase
-                draw_breath(g, phase, ratio); safe_update(win, "-PHASE-", phase)
-                if now - base >= 1.0:
-                    base = now; left -= 1; safe_update(win, "-REST-LEFT-", f"남은 시간: {left}초")
-                    if left <= 0: break
-                win.refresh()
-
-            try:
-                if winsound:
-                    for f in (880,700,550): winsound.Beep(f,120)
-            except Exception:
-                pass
-
-            win.close()
+            now = clock.clock()
+            t_in = (now - ctx.rest_t0) % CYCLE_S
+            if event == T_PHASE:
+                phase, _ = breath_phase(t_in)
+                ctx.tones.play(phase)                       # 재생은 오디오 스레드 (UI 안 멈춤)
+                safe_update(win, "-PHASE-", phase)
+                clock.at(T_PHASE, now + next_phase_in(t_in))
+            elif event == T_BREATH:
+                frames, steps = breath_table()
+                pos = t_in / BREATH_FRAME_S; k = int(pos + 1e-6)    # 부동소수 오차로 한 칸 덜 세지 않게
+                i = k % len(frames)
+                if ctx.breath is None: ctx.breath = BreathView(win["-GBREATH-"])
+                ctx.breath.show(frames[i])
+                clock.at(T_BREATH, now + (k + steps[i] - pos) * BREATH_FRAME_S)   # 모양이 바뀌는 다음 프레임 (멈춤 동안은 안 깸)
+            elif event == T_REST:
+                ctx.rest_left -= 1; safe_update(win, "-REST-LEFT-", f"남은 시간: {ctx.rest_left}초")
+                if ctx.rest_left > 0: clock.again(T_REST, 1.0)
+
+            if event != "-SKIP-" and not (event == T_REST and ctx.rest_left <= 0):
+                continue
+            ctx.tones.play("end")
             ctx.round_no += 1
-            dyn_seed = int(time.time_ns() & 0xFFFFFFFF) if ctx.seed is None else ctx.seed
 
-            if ctx.round_no == 2:
-                if ctx.domain == "english":
-                    rows = load_english(ctx.category)
-                    ctx.deck = pick_english(rows, ctx.prev_ids, ctx.page, dyn_seed)
-                else:
-                    rows = load_level_cards(ctx.domain, ctx.level)
-                    if ctx.fill: rows = ensure_page(rows, ctx.domain, ctx.page)
-                    ctx.deck = pick_round2(rows, page=ctx.page, seed=dyn_seed)
-                ctx.idx=0; ctx.auto=True; ctx.state="study"
-                win = make_window(ctx); render_card(win, ctx)
-
-            elif ctx.round_no == 3:
-                if ctx.domain == "english":
-                    rows = load_english(ctx.category)
-                    ctx.deck = pick_english(rows, ctx.prev_ids, ctx.page, dyn_seed)
-                else:
-                    rows = load_level_cards(ctx.domain, ctx.level)
-                    if ctx.fill: rows = ensure_page(rows, ctx.domain, ctx.page)
-                    ctx.deck = pick_round3(rows, prev_ids=ctx.prev_ids, page=ctx.page, seed=dyn_seed)
+            if ctx.round_no in (2, 3):
+                ctx.deck = ctx.plan.deck(ctx.round_no)
                 ctx.idx=0; ctx.auto=True; ctx.state="study"
-                win = make_window(ctx); render_card(win, ctx)
+                win.show(ctx); render_card(win, ctx)
 
             else:
                 ctx.session_mode=False; ctx.auto=False
                 ctx.total_seconds=(time.time()-ctx.start_time) if ctx.start_time else 0
-                ctx.state="summary"; win = make_window(ctx)
+                ctx.state="summary"; win.show(ctx)
 
         elif ctx.state == "summary":
             if event == "-TO_OUTPUT-":
-                win.close(); ctx.state="output_menu"; win = make_window(ctx)
+                ctx.state="output_menu"; win.show(ctx)
             elif event == "-TO_HOME-":
-                win.close(); ctx.state="home"; win = make_window(ctx)
+                ctx.state="home"; win.show(ctx)
 
         elif ctx.state == "output_menu":
             if event == "-OUT_SAY-":
-                win.close(); ctx.state="output_say"; win = make_window(ctx)
+                ctx.state="output_say"; win.show(ctx)
             elif event == "-OUT_WRITE-":
-                win.close(); ctx.state="output_write"; win = make_window(ctx)
+                ctx.state="output_write"; win.show(ctx)
             elif event == "-TO_HOME-":
-                win.close(); ctx.state="home"; win = make_window(ctx)
-
-        elif ctx.state == "output_say":
-            t=30; base=time.time()
-            while True:
-                ev,_=win.read(timeout=100)
-                if ev in (sg.WIN_CLOSED,"-OUT_DONE-","-TO_HOME-"): break
-                if time.time()-base>=1: t-=1; base=time.time()
-                mm,ss=divmod(t,60); safe_update(win,"-TIMER-",f"{mm:02d}:{ss:02d}")
-                if t<=0: break
-            win.close(); ctx.state="output_menu" if ev!="-TO_HOME-" else "home"; win = make_window(ctx)
-
-        elif ctx.state == "output_write":
-            t=60; base=time.time()
-            while True:
-                ev,_=win.read(timeout=100)
-                if ev in (sg.WIN_CLOSED,"-OUT_DONE-","-TO_HOME-","-SAVE-"): break
-                if time.time()-base>=1: t-=1; base=time.time()
-                mm,ss=divmod(t,60); safe_update(win,"-TIMER-",f"{mm:02d}:{ss:02d}")
-                if t<=0: break
-            win.close(); ctx.state="output_menu" if ev!="-TO_HOME-" else "home"; win = make_window(ctx)
-
+                ctx.state="home"; win.show(ctx)
+
+        elif ctx.state in ("output_say", "output_write"):
+            if event == T_OUT:
+                ctx.out_left -= 1
+                mm,ss=divmod(ctx.out_left,60); safe_update(win,"-TIMER-",f"{mm:02d}:{ss:02d}")
+                if ctx.out_left > 0: clock.again(T_OUT, 1.0)
+            if event == "-TO_HOME-":
+                ctx.state="home"; win.show(ctx)
+            elif event in ("-OUT_DONE-","-SAVE-") or (event == T_OUT and ctx.out_left <= 0):
+                ctx.state="output_menu"; win.show(ctx)
+
+    prof.close()
+    ctx.speech.close()
+    if ctx.speech.engine is not None: print(ctx.speech.summary())
     win.close()
 
 if __name__ == "__main__":
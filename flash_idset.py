@@ -0,0 +1,111 @@
+# flash_idset.py — 정수 카드 id 비트셋 (세션의 "본 카드" 상태)
+# 카드 id = 덱 파일 안의 위치 (flash_repo/.fdk 가 붙임). keyword 문자열을 해싱하지 않고 비트 하나로 기록한다.
+# 1만 장 덱의 세션 상태가 1.25KB, 합/차/개수는 int 변환 후 C 수준 비트 연산.
+# 직렬화: to_b64()/from_b64() (base64url, 끝의 0 바이트 생략) — 웹 클라이언트의 ?seen= 과 같은 형식.
+from __future__ import annotations
+import re, base64
+
+_NONZERO = re.compile(rb"[^\x00]")
+_B64URL = re.compile(r"[A-Za-z0-9_-]*")
+
+class IdSet:
+    """0 이상의 정수 id 집합 (bytearray 비트맵, 비트 i = id i)"""
+    __slots__ = ("_b",)
+
+    def __init__(self, ids=()):
+        self._b = bytearray()
+        for i in ids: self.add(i)
+
+    @classmethod
+    def _of_int(cls, x: int) -> "IdSet":
+        s = cls.__new__(cls)
+        s._b = bytearray(x.to_bytes((x.bit_length() + 7) // 8, "little"))
+        return s
+
+    def _int(self) -> int:
+        return int.from_bytes(self._b, "little")
+
+    def add(self, i: int):
+        if i < 0: raise ValueError(f"negative id: {i}")
+        q = i >> 3
+        if q >= len(self._b): self._b.extend(bytes(q + 1 - len(self._b)))
+        self._b[q] |= 1 << (i & 7)
+
+    def discard(self, i: int):
+        q = i >> 3
+        if 0 <= q < len(self._b): self._b[q] &= ~(1 << (i & 7)) & 0xFF
+
+    def __contains__(self, i) -> bool:
+        q = i >> 3
+        return 0 <= q < len(self._b) and bool(self._b[q] >> (i & 7) & 1)
+
+    def __len__(self) -> int:
+        return self._int().bit_count()
+
+    def __bool__(self) -> bool:
+        return any(self._b)
+
+    def __iter__(self):
+        b = self._b
+        for m in _NONZERO.finditer(b):            # 0 바이트는 C 수준에서 건너뜀
+            q = m.start(); byte = b[q]
+            for r in range(8):
+                if byte >> r & 1: yield (q << 3) | r
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IdSet) and self._int() == other._int()
+
+    def __or__(self, other) -> "IdSet":
+        return IdSet._of_int(self._int() | _as_int(other))
+
+    def __and__(self, other) -> "IdSet":
+        return IdSet._of_int(self._int() & _as_int(other))
+
+    def __sub__(self, other) -> "IdSet":
+        return IdSet._of_int(self._int() & ~_as_int(other))
+
+    __ror__, __rand__ = __or__, __and__
+
+    def __ior__(self, other) -> "IdSet":
+        self._b = (self | other)._b
+        return self
+
+    def copy(self) -> "IdSet":
+        s = IdSet.__new__(IdSet); s._b = bytearray(self._b)
+        return s
+
+    def below(self, n: int) -> "IdSet":
+        """id < n 인 것만 (다른 덱의 id가 섞이지 않게)"""
+        return IdSet._of_int(self._int() & ((1 << n) - 1))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._b).rstrip(b"\x00")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "IdSet":
+        s = cls.__new__(cls); s._b = bytearray(data)
+        return s
+
+    def to_b64(self) -> str:
+        return base64.urlsafe_b64encode(self.to_bytes()).decode("ascii").rstrip("=")
+
+    @classmethod
+    def from_b64(cls, s: str) -> "IdSet":
+        """base64url 문자열(끝 = 생략) → IdSet. 알파벳 밖 글자나 있을 수 없는 길이면 ValueError"""
+        s = (s or "").strip()
+        if not _B64URL.fullmatch(s) or len(s) % 4 == 1:
+            raise ValueError(f"bad id bitmap: {s[:32]!r}")
+        try:
+            return cls.from_bytes(base64.b64decode(s + "=" * (-len(s) % 4), altchars=b"-_", validate=True))
+        except (ValueError, TypeError) as ex:
+            raise ValueError(f"bad id bitmap: {ex}") from None
+
+    def __repr__(self) -> str:
+        return f"IdSet({list(self)})"
+
+def as_idset(ids) -> IdSet:
+    """IdSet 이면 그대로, 아니면 정수 iterable 로 새로 만듦"""
+    return ids if isinstance(ids, IdSet) else IdSet(ids)
+
+def _as_int(other) -> int:
+    return other._int() if isinstance(other, IdSet) else IdSet(other)._int()
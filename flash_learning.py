@@ -1,30 +1,33 @@
 
 # flash_learning.py (집중형 플래시카드 실행 스크립트)  # (모듈 헤더 + 파일 설명 + 실행 진입점 안내)
 # 사용: python flash_learning.py --domain mysql --level 1 --mode r1 --start 0 --page 30 [--seed 42] [--progress]  # (주석 + 사용예 + 선택 옵션 설명)
+#       --srs [--user 이름] 을 붙이면 r2/r3가 복습 기한(간격 반복) 우선으로 선택  # (주석 + 간격 반복 옵션 + 세션 간 기억)
+#       python flash_learning.py --search "필요해" [--page 10]  # (주석 + 전체 덱 검색 + 상위 page개 출력)
+#       FLASH_PROFILE=cprofile (또는 sample) 환경변수로 실행하면 main() 프로파일을 ~/.flash_learning/profiles 에 기록  # (주석 + 프로파일 옵션 + 출력 위치)
 
 import json  # (import 문 + 모듈 불러오기 + json 파일을 읽기 위해)
 import os  # (import 문 + 운영체제 경로 + 파일 경로 결합을 위해)
 import random  # (import 문 + 난수 생성 + r2/r3 무작위 선정을 위해)
 import argparse  # (import 문 + 명령행 인자 파싱 + CLI 실행을 위해)
 import time  # (import 문 + 시간 제어 + 명상 타이머/프로그레스 표시를 위해)
+from flash_srs import Scheduler, card_key, GRADE_SEEN  # (import 문 + 공용 간격 반복 스케줄러 + 세션 간 복습 기록)
+import flash_repo as repo  # (import 문 + 공용 카드 저장소 + LRU 캐시/.fdk 로더)
+import flash_search  # (import 문 + 전체 덱 역색인 + --search 지원)
+import flash_profile  # (import 문 + 환경변수 FLASH_PROFILE 로 켜는 프로파일러 + 꺼져 있으면 빈 호출)
+from flash_sampler import index_for  # (import 문 + 덱 인덱스 + order_index 오프셋 표 재사용)
 
 DATA_DIR = os.path.dirname(__file__)  # (상수 선언 + 현재 스크립트 폴더 + 데이터 파일 상대경로 사용)
 PAGE_DEFAULT = 30  # (상수 선언 + 기본 카드 수 + r1/r2/r3에서 30장 규칙 적용)
 REST_SEC = 120  # (상수 선언 + 명상 휴식 2분 + 루프 사이 타이머 기본값)
 
 def load_level_file(domain: str, level: int):  # (함수 정의 + 타입힌트 + 도메인/레벨 파일 읽기용)
-    """도메인/레벨 JSON 로드 (예: mysql_L1.json)"""  # (docstring + 함수 설명 + 사용 이유)
-    fname = f"{domain}_L{level}.json"  # (포맷 문자열 + 파일명 구성 + 규칙적 네이밍)
-    path = os.path.join(DATA_DIR, fname)  # (경로 결합 + OS 독립성 + 안전한 파일 접근)
-    with open(path, 'r', encoding='utf-8') as f:  # (with 문 + 컨텍스트 관리 + 파일 자동 닫힘)
-        return json.load(f)  # (반환문 + JSON 디코드 결과 + 카드 리스트 반환)
+    """도메인/레벨 덱 로드 (예: mysql_L1.json, 공용 저장소 캐시 경유)"""  # (docstring + 함수 설명 + 사용 이유)
+    return repo.load_level(domain, level)  # (반환문 + 캐시 적중 시 I/O 없음 + 카드 시퀀스 반환)
 
 def pick_round1(cards, start: int = 0, page: int = PAGE_DEFAULT):  # (함수 정의 + r1 순차 선택 + 페이지 개념)
-    """order_index 순서로 정렬 후 start*page ~ start*page+page-1 범위 30장 선택"""  # (docstring + 동작 설명)
-    ordered = sorted(cards, key=lambda c: c.get('order_index', 10**9))  # (정렬 + 키 함수 + 누락시 큰 값 처리)
-    s = start * page  # (계산 + 시작 인덱스 + 페이지 오프셋)
-    e = s + page  # (계산 + 끝 인덱스 + 슬라이스 범위 상한)
-    return ordered[s:e]  # (반환문 + 슬라이싱 결과 + 30장 반환)
+    """order_index 순서에서 start*page ~ start*page+page-1 범위 30장 선택"""  # (docstring + 동작 설명)
+    ids = index_for(cards).order_slice(start * page, page)  # (오프셋 표 조회 + 덱당 한 번만 정렬 + 누락시 맨 뒤)
+    return [cards[i] for i in ids]  # (리스트 내포 + 페이지 카드만 꺼냄 + 30장 반환)
 
 def pick_round2(cards, page: int = PAGE_DEFAULT, seed: int | None = None):  # (함수 정의 + r2 랜덤 선택 + 시드 옵션)
     """전체 풀에서 중복 없이 무작위 30장"""  # (docstring + 동작 설명)
@@ -66,30 +69,57 @@ def meditate(seconds: int = REST_SEC):  # (함수 정의 + 명상 타이머 + 
             print(f"휴식 남은 시간: {s}초")  # (출력 + 남은 시간 + 동기 부여)
         time.sleep(1)  # (대기 + 1초 슬립 + 실시간 카운트)
 
+def show_search(q: str, limit: int):  # (함수 정의 + 검색 결과 출력 + 상위 limit개)
+    """전체 덱 검색 (한글 음절 바이그램/영어 단어 역색인) 결과를 점수순으로 출력"""  # (docstring + 동작 설명)
+    hits = flash_search.search(q, limit)  # (함수 호출 + 색인 조회 + 선형 스캔 없음)
+    if not hits:  # (조건문 + 결과 없음 + 안내)
+        print(f"'{q}' 검색 결과 없음")  # (출력 + 빈 결과 안내 + 사용자 피드백)
+    for score, deck, c in hits:  # (반복문 + 점수/덱/카드 + 순위순)
+        print(f"[{deck}#{c.get('id')}] {c.get('keyword','')}  ({score})")  # (출력 + 덱/카드 id + 키워드)
+        if c.get('meaning'): print(f"- 의미: {c['meaning']}")  # (조건부 출력 + 의미 + 있을 때만)
+
 def main():  # (메인 함수 정의 + 엔트리 포인트 + CLI 실행)
     parser = argparse.ArgumentParser(description="Flash Learning: r1/r2/r3")  # (객체 생성 + 인자 파서 + 설명)
-    parser.add_argument('--domain', required=True, choices=['python','pandas','mysql'])  # (옵션 정의 + 필수 + 값 제한)
-    parser.add_argument('--level', type=int, required=True)  # (옵션 정의 + 정수형 + 레벨 선택)
-    parser.add_argument('--mode', required=True, choices=['r1','r2','r3'])  # (옵션 정의 + 라운드 선택 + r1/r2/r3)
+    parser.add_argument('--domain', choices=['python','pandas','mysql'])  # (옵션 정의 + 학습 시 필수 + 값 제한)
+    parser.add_argument('--level', type=int)  # (옵션 정의 + 정수형 + 레벨 선택)
+    parser.add_argument('--mode', choices=['r1','r2','r3'])  # (옵션 정의 + 라운드 선택 + r1/r2/r3)
     parser.add_argument('--start', type=int, default=0)  # (옵션 정의 + r1 전용 시작 페이지 + 기본 0)
     parser.add_argument('--page', type=int, default=PAGE_DEFAULT)  # (옵션 정의 + 한 번에 뽑을 카드 수 + 기본 30)
     parser.add_argument('--seed', type=int, default=None)  # (옵션 정의 + r2/r3 재현성 시드 + 선택)
     parser.add_argument('--progress', action='store_true')  # (옵션 정의 + 진행바 토글 + 기본 꺼짐)
     parser.add_argument('--rest', type=int, default=REST_SEC)  # (옵션 정의 + 휴식 시간 조정 + 실험용)
+    parser.add_argument('--srs', action='store_true')  # (옵션 정의 + 간격 반복 토글 + 기한 지난 카드 우선)
+    parser.add_argument('--user', default='local')  # (옵션 정의 + 사용자 이름 + 복습 기록 분리)
+    parser.add_argument('--search', default=None)  # (옵션 정의 + 검색어 + 주면 학습 대신 검색)
     args = parser.parse_args()  # (파싱 호출 + 사용자 입력 해석 + 네임스페이스 획득)
-py -3.13 -m pip install pyttsx3
+
+    if args.search is not None:  # (조건문 + 검색 모드 + 학습 옵션 불필요)
+        show_search(args.search, args.page)  # (함수 호출 + 검색 결과 출력 + page개까지)
+        return  # (조기 반환 + 검색만 하고 종료 + 학습 생략)
+    if args.domain is None or args.level is None or args.mode is None:  # (조건문 + 학습 필수 옵션 확인 + 누락 감지)
+        parser.error('--domain, --level, --mode 가 필요합니다 (또는 --search)')  # (오류 출력 + 사용법 안내 + 종료)
 
     cards = load_level_file(args.domain, args.level)  # (함수 호출 + 카드 로드 + 도메인/레벨별)
+    sched = Scheduler.open(args.user, f"{args.domain}_L{args.level}") if args.srs else None  # (조건부 생성 + 덱별 복습 저널 + 꺼져 있으면 None)
     picked = []  # (변수 초기화 + 선택 결과 담을 리스트 + 이후 분기에서 채움)
     if args.mode == 'r1':  # (조건문 + r1 분기 + 순차)
         picked = pick_round1(cards, start=args.start, page=args.page)  # (호출 + 인자 전달 + 30장 페이지)
+    elif args.mode == 'r2' and sched:  # (조건문 + r2 간격 반복 분기 + 기한 우선)
+        picked = sched.pick_due(cards, args.page, rng=random.Random(args.seed))  # (호출 + 기한 지난→새 카드→나머지 + 30장)
     elif args.mode == 'r2':  # (조건문 + r2 분기 + 랜덤)
         picked = pick_round2(cards, page=args.page, seed=args.seed)  # (호출 + 시드 전달 + 재현 가능)
     else:  # (else 분기 + r3 혼합 + 중복 회피 기반)
         # r3는 시연 편의상 동일 레벨 카드에서 중복만 회피  # (주석 + 설계 설명 + 단순 전략)
-        prev = set()  # (집합 생성 + 이전 키워드 모음 + 초기에는 빈 집합)
+        prev = sched.resting(limit=len(cards) - args.page) if sched else set()  # (집합 생성 + 기한 전 카드 회피(최소 page장 남김) + 기본은 빈 집합)
         picked = pick_round3(cards, prev_ids=prev, page=args.page, seed=args.seed)  # (호출 + 혼합 로직 + 결과)
     show_cards(picked, progress=args.progress)  # (UI 출력 + 진행바 선택적 표시 + 한눈형)
+    if sched:  # (조건문 + 간격 반복 사용 시 + 기록)
+        for c in picked: sched.review(card_key(c), GRADE_SEEN)  # (반복 + 본 카드 복습 기록 + 다음 기한 계산)
 
 if __name__ == '__main__':  # (진입점 가드 + 모듈/스크립트 구분 + 직접 실행시만 동작)
-    main()  # (함수 호출 + 프로그램 시작 + 종료시 자연 반환)
+    prof = flash_profile.profiler('cli')  # (객체 생성 + 프로파일러 + 꺼져 있으면 NULL)
+    prof.begin('main')  # (구간 시작 + main 전체 + 명상 대기 포함)
+    try:  # (try 블록 + 예외/조기 종료에도 기록 + 안전성)
+        main()  # (함수 호출 + 프로그램 시작 + 종료시 자연 반환)
+    finally:  # (finally 블록 + 항상 실행 + 파일 기록)
+        prof.close()  # (구간 종료 + pstats/collapsed 파일 기록 + 비활성 시 무동작)
@@ -0,0 +1,121 @@
+# flash_metrics.py — 외부 서비스 없이 쓰는 작은 Prometheus 텍스트 포맷 메트릭
+# Counter / Gauge(콜백) / CounterFunc(콜백) / Histogram 만 지원. 라벨 조합마다 값 하나, 모두 스레드 안전.
+# 프로세스 단위로 집계된다 (--serve 의 프리포크 워커는 각자 따로 셈 → 스크랩한 워커의 값).
+from __future__ import annotations
+import os, bisect, threading
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names: return ""
+    esc = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, esc)) + "}"
+
+def _num(v: float) -> str:
+    return "+Inf" if v == float("inf") else repr(float(v)) if isinstance(v, float) else str(v)
+
+class Metric:
+    kind = ""
+    def __init__(self, name: str, doc: str, labels: tuple = ()):
+        self.name, self.doc, self.labelnames = name, doc, tuple(labels)
+        self._lock = threading.Lock()
+        self._values: dict = {}
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(Metric):
+    kind = "counter"
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        with self._lock: items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+class Gauge(Metric):
+    """스크랩할 때 fn() 을 불러 값을 읽음. fn 은 숫자 또는 {라벨 튜플: 숫자}"""
+    kind = "gauge"
+    def __init__(self, name: str, doc: str, fn, labels: tuple = ()):
+        super().__init__(name, doc, labels)
+        self.fn = fn
+
+    def render(self) -> list:
+        try:
+            v = self.fn()
+        except Exception:
+            return []
+        if v is None: return []
+        items = sorted(v.items()) if isinstance(v, dict) else [((), v)]
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_num(x)}" for k, x in items]
+
+class CounterFunc(Gauge):
+    """다른 모듈이 이미 세고 있는 누적값을 카운터로 노출 (예: LRU 적중 수)"""
+    kind = "counter"
+
+class Histogram(Metric):
+    kind = "histogram"
+    def __init__(self, name: str, doc: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            st = self._values.get(labels)
+            if st is None: st = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            st[0][i] += 1; st[1] += value
+
+    def render(self) -> list:
+        with self._lock: items = sorted((k, (list(c), s)) for k, (c, s) in self._values.items())
+        out = self.header()
+        names = self.labelnames + ("le",)
+        for k, (counts, total) in items:
+            acc = 0
+            for le, c in zip(self.buckets + (float("inf"),), counts):
+                acc += c
+                out.append(f"{self.name}_bucket{_labels(names, k + (_num(le),))} {acc}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, k)} {_num(total)}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, k)} {acc}")
+        return out
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[Metric] = []
+
+    def add(self, m: Metric) -> Metric:
+        self.metrics.append(m)
+        return m
+
+    def counter(self, name, doc, labels=()) -> Counter:
+        return self.add(Counter(name, doc, labels))
+
+    def gauge(self, name, doc, fn, labels=()) -> Gauge:
+        return self.add(Gauge(name, doc, fn, labels))
+
+    def counter_fn(self, name, doc, fn, labels=()) -> CounterFunc:
+        return self.add(CounterFunc(name, doc, fn, labels))
+
+    def histogram(self, name, doc, labels=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.add(Histogram(name, doc, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for m in self.metrics: lines += m.render()
+        return "\n".join(lines) + "\n"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def process_rss() -> int | None:
+    """현재 RSS(바이트). Linux는 /proc, 그 외는 psutil 이 있으면 사용"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
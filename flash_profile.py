@@ -0,0 +1,234 @@
+# flash_profile.py — 환경변수로 켜는 프로파일러 (웹 요청 / 데스크톱 이벤트 / CLI 공용)
+#   FLASH_PROFILE=cprofile   결정적 프로파일 (cProfile) → <이름>-....pstats   (python -m pstats 로 열기)
+#                            3.12+ 에서는 프로세스에 한 구간씩만 (겹친 구간은 건너뜀, 웹 서버는 sample 로 기록)
+#   FLASH_PROFILE=sample     샘플링 (FLASH_PROFILE_INTERVAL_MS 간격 스택 수집) → ....collapsed (flamegraph.pl/speedscope)
+#   FLASH_PROFILE_EVERY=N    N 구간(요청/이벤트)마다 파일 하나 (기본 1)
+#   FLASH_PROFILE_MATCH=re   라벨(웹: 경로, 데스크톱: "상태:이벤트")이 맞는 구간만
+#   FLASH_PROFILE_DIR=경로   기본 ~/.flash_learning/profiles
+# 꺼져 있으면 profiler() 가 아무것도 안 하는 NULL 객체를 돌려준다 (구간당 빈 메서드 호출 두 번).
+from __future__ import annotations
+import os, re, sys, time, atexit, pstats, cProfile, threading
+from collections import Counter
+from contextlib import contextmanager
+
+MODE = os.environ.get("FLASH_PROFILE", "").strip().lower()
+EVERY = max(1, int(os.environ.get("FLASH_PROFILE_EVERY", "1") or 1))
+INTERVAL = max(0.0005, float(os.environ.get("FLASH_PROFILE_INTERVAL_MS", "5") or 5) / 1000)
+MATCH = re.compile(os.environ["FLASH_PROFILE_MATCH"]) if os.environ.get("FLASH_PROFILE_MATCH") else None
+OUT_DIR = os.environ.get("FLASH_PROFILE_DIR") or os.path.join(os.path.expanduser("~"), ".flash_learning", "profiles")
+MODES = ("cprofile", "sample")
+ENABLED = MODE in MODES
+
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+_seq_lock = threading.Lock()
+_seq = 0
+
+def _out_path(name: str, ext: str) -> str:
+    global _seq
+    with _seq_lock:
+        _seq += 1; n = _seq
+    os.makedirs(OUT_DIR, exist_ok=True)
+    stem = _SAFE.sub("_", name).strip("_") or "profile"
+    return os.path.join(OUT_DIR, f"{stem}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{n:04d}.{ext}")
+
+# ---------- 샘플러 (프로세스에 스레드 하나, 구간 안에 있는 스레드만 수집) ----------
+class _Sampler:
+    def __init__(self):
+        self._active: dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, tid: int, stacks: Counter):
+        with self._lock:
+            self._active[tid] = stacks
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="flash-sampler", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, tid: int):
+        with self._lock: self._active.pop(tid, None)
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            time.sleep(INTERVAL)
+            with self._lock:
+                if not self._active: self._thread = None; return
+                active = dict(self._active)
+            frames = sys._current_frames()
+            for tid, stacks in active.items():
+                f = frames.get(tid)
+                if f is None or tid == me: continue
+                parts = []
+                while f is not None:
+                    co = f.f_code
+                    parts.append(f"{co.co_name} ({os.path.basename(co.co_filename)}:{co.co_firstlineno})")
+                    f = f.f_back
+                stacks[";".join(reversed(parts))] += 1
+
+_SAMPLER = _Sampler()
+
+# 3.12+ 의 cProfile 은 sys.monitoring 위에서 돌아 프로세스에 하나만 켤 수 있다 (두 번째 enable() 은 ValueError).
+# 여러 스레드가 동시에 구간을 열면 먼저 잡은 스레드만 기록하고 나머지 구간은 건너뜀 (skipped).
+_CPROFILE_LOCK = threading.Lock() if sys.version_info >= (3, 12) else None
+
+# ---------- 프로파일러 ----------
+class NullProfiler:
+    """비활성 상태: 모든 호출이 즉시 반환"""
+    def begin(self, label: str = ""): pass
+    def end(self): pass
+    def flush(self): return None
+    def close(self): pass
+
+    @contextmanager
+    def span(self, label: str = ""):
+        yield
+
+NULL = NullProfiler()
+
+class Profiler(NullProfiler):
+    """begin(label) ~ end() 구간만 누적, every 구간마다 파일로 기록. 한 스레드에서만 사용"""
+    def __init__(self, name: str, mode: str = MODE, every: int = EVERY):
+        self.name, self.mode, self.every = name, mode, every
+        self.spans = 0
+        self.skipped = 0                # 다른 스레드가 cProfile 을 쓰는 중이라 건너뛴 구간
+        self._on = False
+        self._locked = False
+        self._label = ""
+        self._reset()
+
+    def _reset(self):
+        self._prof = cProfile.Profile() if self.mode == "cprofile" else None
+        self._stacks: Counter = Counter()
+
+    def begin(self, label: str = ""):
+        if self._on or (MATCH and not MATCH.search(label)): return
+        if self._prof:
+            if _CPROFILE_LOCK and not _CPROFILE_LOCK.acquire(blocking=False):
+                self.skipped += 1; return
+            try:
+                self._prof.enable()
+            except ValueError:                  # 디버거 등 다른 도구가 켜 둠
+                if _CPROFILE_LOCK: _CPROFILE_LOCK.release()
+                self.skipped += 1; return
+            self._locked = _CPROFILE_LOCK is not None
+        else:
+            _SAMPLER.watch(threading.get_ident(), self._stacks)
+        self._on, self._label = True, label
+
+    def end(self):
+        if not self._on: return
+        if self._prof:
+            self._prof.disable()
+            if self._locked: self._locked = False; _CPROFILE_LOCK.release()
+        else:
+            _SAMPLER.unwatch(threading.get_ident())
+        self._on = False
+        self.spans += 1
+        if self.spans % self.every == 0: self.flush()
+
+    def flush(self) -> str | None:
+        """지금까지 모은 것을 파일로 쓰고 비움 (모은 게 없으면 None)"""
+        name = f"{self.name}-{self._label}" if self.every == 1 and self._label else self.name
+        path = None
+        if self._prof:
+            path = _out_path(name, "pstats"); self._prof.dump_stats(path)
+        elif self._stacks:
+            path = _out_path(name, "collapsed")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, n in self._stacks.most_common():
+                    f.write(f"{stack} {n}\n")
+        self._reset()
+        return path
+
+    def close(self):
+        self.end()
+        if self.spans % self.every: self.flush()
+
+    @contextmanager
+    def span(self, label: str = ""):
+        self.begin(label)
+        try:
+            yield
+        finally:
+            self.end()
+
+def profiler(name: str, mode: str | None = None, every: int | None = None) -> NullProfiler:
+    """FLASH_PROFILE 이 켜져 있으면 Profiler, 아니면 NULL"""
+    mode = MODE if mode is None else mode
+    if mode not in MODES: return NULL
+    return Profiler(name, mode, EVERY if every is None else every)
+
+class SharedProfiler(NullProfiler):
+    """여러 스레드가 구간을 여는 경우 (웹 요청): 구간은 스레드별로 모으고, 통계와 구간 수는 프로세스에 하나.
+    every 구간마다 파일 하나, 남은 구간은 종료 시(atexit) 기록.
+    3.12+ 의 cProfile 은 구간 밖 스레드의 프레임까지 섞이므로 cprofile 요청은 sample 로 바꿔 기록"""
+    def __init__(self, name: str, mode: str = MODE, every: int = EVERY):
+        if mode == "cprofile" and _CPROFILE_LOCK is not None:
+            print(f"flash_profile: Python {sys.version_info[0]}.{sys.version_info[1]} 에서는 멀티스레드 cprofile 구간이 "
+                  "다른 스레드를 섞으므로 sample 로 기록", file=sys.stderr)
+            mode = "sample"
+        self.name, self.mode, self.every = name, mode, every
+        self.spans = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()         # 스레드의 열린 구간 (데이터, 라벨)
+        self._stats: pstats.Stats | None = None
+        self._stacks: Counter = Counter()
+        self._label = ""
+        atexit.register(self.close)
+
+    def begin(self, label: str = ""):
+        if getattr(self._local, "span", None) or (MATCH and not MATCH.search(label)): return
+        if self.mode == "cprofile":
+            data = cProfile.Profile(); data.enable()
+        else:
+            data = Counter(); _SAMPLER.watch(threading.get_ident(), data)
+        self._local.span = (data, label)
+
+    def end(self):
+        span = getattr(self._local, "span", None)
+        if not span: return
+        self._local.span = None
+        data, label = span
+        if self.mode == "cprofile": data.disable()
+        else: _SAMPLER.unwatch(threading.get_ident())
+        with self._lock:
+            if self.mode == "sample":
+                self._stacks.update(data)
+            elif self._stats is None:
+                self._stats = pstats.Stats(data)
+            else:
+                self._stats.add(data)
+            self.spans += 1; self._label = label
+            due = self.spans % self.every == 0
+        if due: self.flush()
+
+    def flush(self) -> str | None:
+        with self._lock:
+            stats, stacks = self._stats, self._stacks
+            self._stats, self._stacks = None, Counter()
+            label = self._label
+        name = f"{self.name}-{label}" if self.every == 1 and label else self.name
+        path = None
+        if stats is not None:
+            path = _out_path(name, "pstats"); stats.dump_stats(path)
+        elif stacks:
+            path = _out_path(name, "collapsed")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, n in stacks.most_common():
+                    f.write(f"{stack} {n}\n")
+        return path
+
+    def close(self):
+        self.end()
+        self.flush()
+
+_SHARED: dict[str, SharedProfiler] = {}
+
+def shared_profiler(name: str) -> NullProfiler:
+    """이름마다 프로세스에 하나 (웹 요청처럼 여러 스레드에서 구간이 열릴 때). 꺼져 있으면 NULL"""
+    if MODE not in MODES: return NULL
+    with _seq_lock:
+        p = _SHARED.get(name)
+        if p is None: p = _SHARED[name] = SharedProfiler(name)
+    return p
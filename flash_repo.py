@@ -0,0 +1,113 @@
+# flash_repo.py — 세 프런트엔드(flash_learning / flash_desktop / flash_web) 공용 카드 저장소
+# 덱은 (실제 경로, 파일 mtime) 키로 LRU 캐시 → 같은 파일이면 회차를 반복해도, 어느 모듈이 불러도 다시 읽지 않음.
+# 파일이 바뀌면 mtime이 달라져 자연히 새로 읽고, 옛 항목은 LRU에서 밀려난다.
+from __future__ import annotations
+import os, threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from flash_deckpack import load_deck, pack_path
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_SIZE = 32
+
+EN_FILES = {
+    "vocab": "english_vocab.json",
+    "coding": "english_coding.json",
+    "pattern": "english_pattern.json",
+    "conversation": "english_conversation.json",
+}
+
+class LRUCache:
+    """스레드 안전한 작은 LRU (적중/실패 횟수 기록)"""
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key); self.hits += 1
+                return self._data[key]
+        value = loader()                        # 읽기는 잠금 밖에서
+        with self._lock:
+            self.misses += 1
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        with self._lock: self._data.clear()
+
+CACHE = LRUCache()
+
+def stamp(path: str):
+    """캐시 키용 파일 버전 (.fdk 가 있으면 그쪽도 포함)"""
+    out = []
+    for p in (path, pack_path(path)):
+        try:
+            st = os.stat(p); out.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+def _read(path: str) -> Sequence:
+    cards = load_deck(path)
+    if isinstance(cards, list):
+        for i, c in enumerate(cards):
+            if isinstance(c, dict): c["id"] = i     # .fdk 와 같게: 카드 id = 파일 내 위치
+    return cards
+
+def load_path(path: str) -> Sequence:
+    """경로의 덱 (캐시). 키는 실제 경로 하나 → 웹 CardStore / 검색 색인 / 레벨·영어 로더가 같은 파일을 한 번만 읽음"""
+    return CACHE.get_or_load(("cards", os.path.realpath(path), stamp(path)), lambda: _read(path))
+
+# ---- 경로 ----
+def level_path(domain: str, level: int) -> str:
+    return os.path.join(DATA_DIR, f"{domain}_L{level}.json")
+
+def master_path(domain: str) -> str:
+    return os.path.join(DATA_DIR, f"{domain}_master.json")
+
+def english_path(category: str, roots: Sequence[str] | None = None) -> str:
+    """영어 카테고리 파일: roots 순서로 찾음 (기본: 루트 → data/)"""
+    fname = EN_FILES.get(category, "english_vocab.json")
+    roots = roots or (DATA_DIR, os.path.join(DATA_DIR, "data"))
+    cands = [os.path.join(r, fname) for r in roots]
+    for p in cands:
+        if os.path.exists(p) or os.path.exists(pack_path(p)):
+            return p
+    return cands[0]
+
+# ---- 덱 ----
+def load_level(domain: str, level: int) -> Sequence:
+    return load_path(level_path(domain, level))
+
+def load_master(domain: str) -> Sequence:
+    return load_path(master_path(domain))
+
+def load_english(category: str, roots: Sequence[str] | None = None) -> Sequence:
+    return load_path(english_path(category, roots))
+
+def keyword_set(domain: str, part) -> frozenset:
+    """덱의 keyword 집합 (part: 레벨 번호 / "master" / 영어 카테고리)"""
+    path = (master_path(domain) if part == "master" else
+            english_path(part) if domain == "english" else level_path(domain, part))
+    def build():
+        cards = load_path(path)
+        return frozenset(c.get("keyword") for c in cards)
+    return CACHE.get_or_load(("keywords", domain, part, stamp(path)), build)
+
+def master_extra(domain: str, level: int) -> list:
+    """마스터에는 있고 레벨 덱에는 없는 카드 (레벨 부족분 보충용)"""
+    lp, mp = level_path(domain, level), master_path(domain)
+    def build():
+        seen = keyword_set(domain, level)
+        return [c for c in load_master(domain) if c.get("keyword") not in seen]
+    return CACHE.get_or_load(("extra", domain, level, stamp(lp), stamp(mp)), build)
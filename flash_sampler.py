@@ -0,0 +1,131 @@
+# flash_sampler.py — 정수 카드 id 기반 회차 샘플러 (덱 크기와 무관하게 O(k) 기대 시간)
+# 덱마다 한 번 DeckIndex(태그 파티션 + keyword→id)를 만들어 두고,
+# 본 카드 집합(IdSet 등 id 집합) 밖에서 거절 샘플링으로 뽑는다. 본 카드가 대부분이면 남은 후보만 나열(드문 경우).
+# 중복 판정은 카드 id 기준 — keyword가 같은 서로 다른 카드도 각각 뽑힌다.
+# 순차(r1) 목록은 order_index 순 오프셋 표를 처음 한 번만 정렬해 두고 페이지를 O(page)로 자른다.
+from __future__ import annotations
+import random, bisect, threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from array import array
+from flash_idset import IdSet
+
+ORDER_MISSING = 10**9                   # order_index 없는 카드는 맨 뒤 (pick_round1 과 같음)
+
+class DeckIndex:
+    """카드 시퀀스에 대한 id 인덱스 (id = 시퀀스 내 위치)"""
+    def __init__(self, cards: Sequence):
+        self.cards = cards
+        self.n = len(cards)
+        self.kw_ids: dict = {}
+        self.core, self.applied, self.other = array("I"), array("I"), array("I")
+        get = getattr(cards, "value", None)         # PackedDeck 이면 필요한 필드만 디코드
+        for i in range(self.n):
+            if get:
+                kw, tags = get(i, "keyword"), get(i, "tags") or ()
+            else:
+                c = cards[i]; kw, tags = c.get("keyword"), c.get("tags") or ()
+            self.kw_ids.setdefault(kw, []).append(i)
+            is_core, is_applied = "core" in tags, "applied" in tags
+            if is_core: self.core.append(i)
+            if is_applied: self.applied.append(i)
+            if not (is_core or is_applied): self.other.append(i)
+        self.all = range(self.n)
+        self._order: tuple | None = None
+
+    def order(self) -> tuple:
+        """(정렬 키, 카드 id) 오프셋 표 — order_index 순, 같으면 id 순. 키 = order_index<<32 | id"""
+        if self._order is None:
+            get = getattr(self.cards, "value", None)
+            keys = []
+            for i in range(self.n):
+                oi = get(i, "order_index") if get else self.cards[i].get("order_index")
+                keys.append(((oi if isinstance(oi, int) else ORDER_MISSING) << 32) | i)
+            keys.sort()
+            self._order = (array("q", keys), array("I", (k & 0xFFFFFFFF for k in keys)))
+        return self._order
+
+    def order_slice(self, offset: int, limit: int) -> list:
+        """order_index 순 offset 번째부터 limit 개의 id"""
+        return list(self.order()[1][max(0, offset):max(0, offset) + max(0, limit)])
+
+    def page_after(self, cursor: str | None, limit: int) -> tuple:
+        """커서(마지막으로 받은 카드의 "order_index.id") 다음 limit 개 → (id 목록, 다음 커서 또는 None).
+        커서가 위치가 아니라 정렬 키라서 덱이 바뀌어도 이어 읽기가 어긋나지 않는다. 형식이 틀리면 ValueError"""
+        keys, ids = self.order()
+        start = 0
+        if cursor:
+            oi, i = cursor.split(".")
+            start = bisect.bisect_right(keys, (int(oi) << 32) | int(i))
+        end = min(len(ids), start + max(0, limit))
+        nxt = None
+        if end < len(ids) and end > start:
+            k = keys[end - 1]
+            nxt = f"{k >> 32}.{k & 0xFFFFFFFF}"
+        return list(ids[start:end]), nxt
+
+    def ids_of(self, keywords) -> IdSet:
+        """keyword 집합 → 해당 카드 id 집합 (간격 반복 기록 등 keyword 기반 상태 변환용)"""
+        out = IdSet()
+        for kw in keywords:
+            for i in self.kw_ids.get(kw, ()): out.add(i)
+        return out
+
+    def take(self, pool: Sequence, k: int, ok, rng: random.Random, out: list, taken: set):
+        """pool 중 ok(id)이고 아직 안 뽑힌 id를 무작위로 k개까지 out에 추가"""
+        need = k - len(out)
+        if need <= 0 or not pool: return
+        for _ in range(4 * need + 32):              # 거절 샘플링: 후보 비율이 높으면 O(k)
+            if len(out) >= k: return
+            i = pool[rng.randrange(len(pool))]
+            if ok(i) and i not in taken:
+                out.append(i); taken.add(i)
+        rest = [i for i in pool if ok(i) and i not in taken]
+        rng.shuffle(rest)
+        for i in rest:
+            if len(out) >= k: return
+            out.append(i); taken.add(i)
+
+_INDEXES: OrderedDict = OrderedDict()
+_INDEXES_LOCK = threading.Lock()        # 웹 요청 스레드 + 데스크톱 미리 뽑기 스레드
+
+def index_for(cards: Sequence) -> DeckIndex:
+    """같은 덱 객체면 인덱스를 재사용 (최근 8개)"""
+    key = id(cards)
+    with _INDEXES_LOCK:
+        ix = _INDEXES.get(key)
+        if ix is not None and ix.cards is cards and ix.n == len(cards):
+            _INDEXES.move_to_end(key)
+            return ix
+    ix = DeckIndex(cards)                   # 만들기는 잠금 밖에서
+    with _INDEXES_LOCK:
+        _INDEXES[key] = ix
+        _INDEXES.move_to_end(key)
+        while len(_INDEXES) > 8: _INDEXES.popitem(last=False)
+    return ix
+
+def list_page(cards: Sequence, cursor: str | None = None, limit: int = 30) -> tuple:
+    """order_index 순 커서 페이지: (카드 목록, 다음 커서 또는 None)"""
+    ids, nxt = index_for(cards).page_after(cursor, limit)
+    return [cards[i] for i in ids], nxt
+
+def sample_round3(ix: DeckIndex, seen, page: int, rng: random.Random) -> list:
+    """r3 혼합: core 10 → applied (합계 20까지) → 나머지(core/applied 아닌 카드)로 page장, 그래도 모자라면 전체에서.
+    안 본 카드가 page장 미만이면 본 카드도 허용
+    seen: 이 덱의 id 집합 (id < ix.n)"""
+    unseen_n = ix.n - len(seen)
+    ok = (lambda i: i not in seen) if unseen_n >= page else (lambda i: True)
+    out, taken = [], set()
+    ix.take(ix.core, min(10, page), ok, rng, out, taken)
+    ix.take(ix.applied, min(20, page), ok, rng, out, taken)
+    ix.take(ix.other, page, ok, rng, out, taken)
+    ix.take(ix.all, page, ok, rng, out, taken)
+    ix.take(ix.all, page, lambda i: True, rng, out, taken)
+    return out
+
+def sample_english(ix: DeckIndex, seen, k: int, rng: random.Random) -> list:
+    """안 본 카드에서 무작위 k장, 모자라면 본 카드로 채움 (id 중복 없음)"""
+    out, taken = [], set()
+    ix.take(ix.all, k, lambda i: i not in seen, rng, out, taken)
+    ix.take(ix.all, k, lambda i: True, rng, out, taken)
+    return out
@@ -0,0 +1,121 @@
+# flash_search.py — 전체 덱 검색 (역색인, 한 번 만들고 재사용)
+# 대상: python/pandas/mysql 마스터 + 영어 4개 카테고리(data/ 우선)
+# 색인어:
+#   - 한글: 음절 바이그램 ("필요해" → 필요, 요해) + 음절 하나(한 글자 질의용) + 초성 바이그램("ㅍㅇ" → 필요)
+#   - 그 외: 소문자 단어 토큰 (keyword / usage_one_liner / items 의 en·ko)
+# 점수 = Σ 필드 가중치 × idf. 질의어 모두를 포함하는 카드만(AND), 가장 드문 색인어부터 교집합.
+# 마지막 영어 단어는 접두어로도 찾음 (정렬된 어휘에서 bisect → 스캔 없음).
+from __future__ import annotations
+import os, re, math, bisect
+import flash_repo as repo
+
+FIELD_WEIGHT = {"keyword": 3.0, "meaning": 2.0, "usage_one_liner": 1.0, "items": 1.0}
+MASTER_DOMAINS = ("python", "pandas", "mysql")
+PREFIX_LIMIT = 32                       # 접두어 확장 최대 어휘 수
+
+_WORD = re.compile(r"[a-z0-9_]+")
+_HANGUL = re.compile(r"[가-힣]+")
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+def _choseong(syl: str) -> str:
+    return _CHOSEONG[(ord(syl) - 0xAC00) // 588]
+
+def terms(text: str, index: bool = True) -> list:
+    """텍스트 → 색인어 목록 (중복 포함). 질의 쪽(index=False)은 두 글자 이상 덩어리에서 음절 바이그램만 쓴다"""
+    text = (text or "").lower()
+    out = _WORD.findall(text)
+    for run in _HANGUL.findall(text):
+        if index or len(run) == 1: out.extend(run)
+        for a, b in zip(run, run[1:]):
+            out.append(a + b)
+            if index: out.append("^" + _choseong(a) + _choseong(b))
+    return out
+
+def query_terms(q: str) -> list:
+    """질의 → 색인어 (초성만 입력한 덩어리는 초성 바이그램으로)"""
+    q = (q or "").lower()
+    out = terms(q, index=False)
+    for run in re.findall(f"[{_CHOSEONG}]+", q):
+        out += ["^" + run[i:i + 2] for i in range(len(run) - 1)]
+    return list(dict.fromkeys(out))
+
+def _card_fields(c: dict):
+    for f in ("keyword", "meaning", "usage_one_liner"):
+        if c.get(f): yield f, c[f]
+    for it in c.get("items") or ():
+        if isinstance(it, dict):
+            yield "items", f"{it.get('en', '')} {it.get('ko', '')}"
+
+class SearchIndex:
+    """색인어 → {문서 번호: 가중치}. 문서 = (덱 이름, 카드 id)"""
+    def __init__(self, decks: dict):
+        self.decks = decks
+        self.docs: list[tuple] = []
+        self.post: dict[str, dict[int, float]] = {}
+        for name, cards in decks.items():
+            for i in range(len(cards)):
+                c = cards[i]
+                d = len(self.docs); self.docs.append((name, i))
+                for field, text in _card_fields(c):
+                    w = FIELD_WEIGHT[field]
+                    for t in terms(text):
+                        p = self.post.setdefault(t, {})
+                        p[d] = p.get(d, 0.0) + w
+        n = max(1, len(self.docs))
+        self.idf = {t: math.log(1 + n / len(p)) for t, p in self.post.items()}
+        self.vocab = sorted(t for t in self.post if _WORD.fullmatch(t))
+
+    def _expand(self, word: str) -> list:
+        """word 로 시작하는 어휘 (최대 PREFIX_LIMIT개)"""
+        lo = bisect.bisect_left(self.vocab, word)
+        hi = bisect.bisect_left(self.vocab, word + "\x7f", lo, min(len(self.vocab), lo + PREFIX_LIMIT))
+        return self.vocab[lo:hi]
+
+    def _postings(self, term: str, prefix: bool) -> tuple:
+        """(문서→가중치, idf). 접두어 확장 시에는 합친 목록(이미 idf 반영, idf=1)"""
+        if not prefix or not _WORD.fullmatch(term):
+            return self.post.get(term, {}), self.idf.get(term, 0.0)
+        out: dict[int, float] = {}
+        for t in self._expand(term):
+            s = self.idf[t] * (1.0 if t == term else 0.5)      # 완전 일치 우대
+            for d, w in self.post[t].items():
+                out[d] = max(out.get(d, 0.0), w * s)
+        return out, 1.0
+
+    def search(self, q: str, limit: int = 20, deck: str | None = None) -> list:
+        """[(점수, 덱 이름, 카드)] 점수 내림차순"""
+        ts = query_terms(q)
+        if not ts: return []
+        last_word = _WORD.findall(q.lower())[-1:] or [None]
+        lists = [self._postings(t, t == last_word[0]) for t in ts]
+        lists.sort(key=lambda x: len(x[0]))
+        cand = lists[0][0].keys()
+        for p, _ in lists[1:]:              # 가장 드문 목록부터 교집합
+            if not cand: return []
+            cand = [d for d in cand if d in p]
+        if deck:
+            cand = [d for d in cand if self.docs[d][0] == deck]
+        scores = {d: sum(p[d] * idf for p, idf in lists) for d in cand}
+        top = sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:limit]
+        return [(round(s, 3), self.docs[d][0], self.decks[self.docs[d][0]][self.docs[d][1]]) for d, s in top]
+
+EN_ROOTS = (os.path.join(repo.DATA_DIR, "data"), repo.DATA_DIR)     # 영어는 data/ 우선 (웹과 같은 덱)
+
+def deck_paths() -> dict:
+    """검색 대상 덱 이름 → JSON 경로"""
+    out = {f"{d}_master": repo.master_path(d) for d in MASTER_DOMAINS}
+    for cat in repo.EN_FILES:
+        out[f"english_{cat}"] = repo.english_path(cat, EN_ROOTS)
+    return out
+
+def load_decks() -> dict:
+    """저장소 캐시의 덱 (파일 경로가 키라 웹 CardStore 가 읽은 것과 같은 객체)"""
+    return {name: repo.load_path(p) for name, p in deck_paths().items()}
+
+def get_index() -> SearchIndex:
+    """공용 저장소 캐시에 얹은 색인 (덱 파일이 바뀌면 다시 만듦)"""
+    key = ("search", *(repo.stamp(p) for p in deck_paths().values()))
+    return repo.CACHE.get_or_load(key, lambda: SearchIndex(load_decks()))
+
+def search(q: str, limit: int = 20, deck: str | None = None) -> list:
+    return get_index().search(q, limit, deck)
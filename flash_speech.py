@@ -0,0 +1,163 @@
+# flash_speech.py — 데스크톱용 TTS 작업 스레드 (엔진 하나를 스레드 하나만 만짐)
+# 발화마다 스레드를 새로 띄우지 않고, 길이 제한 큐 + 작업 스레드 하나로 처리한다.
+#   say(text, voice, tag, delay)  tag = 어느 카드의 발화인지 (예: (라운드, 인덱스))
+#   retarget(tag)                 지금 카드가 tag 로 바뀜 → 다른 카드의 대기 발화는 버리고, 말하는 중이면 끊음
+#   cancel()                      모두 버림 (학습 화면을 떠날 때)
+# UI 스레드는 상태만 바꾸고, 말하는 중인 발화는 작업 스레드가 started-word 콜백에서 engine.stop() 으로 끊는다
+# (엔진은 작업 스레드만 만짐).
+# 같은 (tag, 채널) 발화가 큐에 있으면 새 것으로 바꾼다 (버튼 연타 → 한 번만 읽음).
+# 큐가 차면 가장 오래된 발화를 버린다. 지연/결과는 flash_metrics 로 집계 (summary() 로 요약).
+# 엔진은 작업 스레드가 open() 으로 만든다 (드라이버 로드/보이스 검색이 느려도 화면은 바로 뜸).
+# 준비되기 전의 say() 는 큐에서 기다리고, 엔진을 못 만들면 이후 호출은 모두 무시.
+from __future__ import annotations
+import time, threading
+from collections import deque
+import flash_metrics as fm
+
+QUEUE_MAX = 4
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SPEAK_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+OUTCOMES = ("spoken", "interrupted", "stale", "dropped", "coalesced", "error")
+
+class _Item:
+    __slots__ = ("seq", "text", "voice", "tag", "channel", "queued", "not_before")
+    def __init__(self, seq, text, voice, tag, channel, delay):
+        self.seq, self.text, self.voice, self.tag, self.channel = seq, text, voice, tag, channel
+        self.queued = time.perf_counter()
+        self.not_before = self.queued + delay
+
+class SpeechWorker:
+    """pyttsx3 엔진 하나를 전담하는 스레드.
+    open() → (엔진, {채널: 보이스 id}) 를 작업 스레드에서 부름. 엔진이 None 이면 모든 호출이 아무것도 안 함"""
+    def __init__(self, open, maxsize: int = QUEUE_MAX):
+        self.engine = None
+        self.voices: dict = {}
+        self.failed = False
+        self._open = open
+        self.maxsize = maxsize
+        self._q: deque[_Item] = deque()
+        self._cv = threading.Condition()
+        self._seq = 0
+        self._tag = None                 # 지금 유효한 카드 (None 이면 tag 상관없이 유효)
+        self._cur: _Item | None = None   # 말하는 중인 발화
+        self._closed = False
+        self.metrics = fm.Registry()
+        self.m_latency = self.metrics.histogram("flash_tts_start_latency_seconds", "say() 에서 재생 시작까지 (지연 delay 제외)", buckets=LATENCY_BUCKETS)
+        self.m_speak = self.metrics.histogram("flash_tts_speak_seconds", "발화 하나의 재생 시간", buckets=SPEAK_BUCKETS)
+        self.m_total = self.metrics.counter("flash_tts_utterances_total", "발화 결과별 수", ("outcome",))
+        self.metrics.gauge("flash_tts_queue_depth", "대기 중인 발화 수", lambda: len(self._q))
+        self._thread = threading.Thread(target=self._run, name="flash-tts", daemon=True)
+        self._thread.start()
+
+    # ---------- UI 스레드 쪽 ----------
+    def say(self, text: str, voice: str | None = None, tag=None, channel: str = "", delay: float = 0.0):
+        if self.failed or not text: return
+        with self._cv:
+            if self._closed or self.failed: return
+            self._seq += 1
+            item = _Item(self._seq, text, voice, tag, channel, delay)
+            for old in [x for x in self._q if x.tag == tag and x.channel == channel]:
+                self._q.remove(old); self.m_total.inc("coalesced")
+            while len(self._q) >= self.maxsize:
+                self._q.popleft(); self.m_total.inc("dropped")
+            self._q.append(item)
+            self._cv.notify()
+
+    def retarget(self, tag):
+        """tag 가 아닌 카드의 발화를 버림 (말하는 중이면 다음 단어에서 끊김)"""
+        with self._cv:
+            self._tag = tag
+            self._drop(lambda x: x.tag != tag)
+
+    def cancel(self):
+        with self._cv:
+            self._tag = object()          # 어떤 발화와도 안 맞음 → 다음 say() 의 tag 로 retarget 할 때까지
+            self._drop(lambda x: True)
+
+    def close(self, timeout: float = 1.0):
+        self.cancel()
+        with self._cv:
+            self._closed = True
+            self._cv.notify()
+        if self._thread: self._thread.join(timeout)
+
+    def summary(self) -> str:
+        counts = {k[0]: int(v) for k, v in self.m_total._values.items()}
+        lat = self.m_latency._values.get(())
+        avg = f", 평균 시작 지연 {lat[1] / sum(lat[0]) * 1000:.0f}ms" if lat and sum(lat[0]) else ""
+        return "TTS: " + ", ".join(f"{k} {counts[k]}" for k in OUTCOMES if counts.get(k)) + avg
+
+    # ---------- 작업 스레드 ----------
+    def _drop(self, pred):
+        keep = deque()
+        for x in self._q:
+            if pred(x): self.m_total.inc("stale")
+            else: keep.append(x)
+        self._q = keep
+
+    def _valid(self, item: _Item) -> bool:
+        return self._tag is None or item.tag == self._tag
+
+    def _on_word(self, name, location, length):
+        """작업 스레드 (runAndWait 안): 지금 발화가 더 이상 유효하지 않으면 끊음"""
+        cur = self._cur
+        if cur is not None and not self._valid(cur):
+            try:
+                self.engine.stop()
+            except Exception:
+                pass
+
+    def _next(self) -> _Item | None:
+        with self._cv:
+            while True:
+                if self._closed: return None
+                now = time.perf_counter()
+                if self._q:
+                    item = self._q[0]
+                    if item.not_before <= now:
+                        self._q.popleft()
+                        if not self._valid(item):
+                            self.m_total.inc("stale"); continue
+                        self._cur = item
+                        return item
+                    self._cv.wait(item.not_before - now)
+                else:
+                    self._cv.wait()
+
+    def _start(self):
+        try:
+            eng, voices = self._open()
+        except Exception:
+            eng, voices = None, {}
+        if eng is not None:
+            try:
+                eng.connect("started-word", self._on_word)     # 말하는 중에도 끊을 수 있게
+            except Exception:
+                pass
+        with self._cv:
+            self.engine, self.voices = eng, dict(voices or {})
+            if eng is None:
+                self.failed = True
+                self._q.clear()
+        return eng
+
+    def _run(self):
+        eng = self._start()
+        if eng is None: return
+        while True:
+            item = self._next()
+            if item is None: return
+            t0 = time.perf_counter()
+            self.m_latency.observe(max(0.0, t0 - item.not_before))
+            try:
+                voice = item.voice or self.voices.get(item.channel)
+                if voice: eng.setProperty("voice", voice)
+                eng.say(item.text, str(item.seq))
+                eng.runAndWait()
+                outcome = "spoken" if self._valid(item) else "interrupted"
+            except Exception:
+                outcome = "error"
+            self.m_speak.observe(time.perf_counter() - t0)
+            self.m_total.inc(outcome)
+            with self._cv:
+                self._cur = None
@@ -0,0 +1,233 @@
+# flash_srs.py — 간격 반복(SM-2) 스케줄러. flash_learning / flash_desktop / flash_web 공용
+# 카드별 ease/interval/due 를 힙(due 순)으로 관리 → 기한 지난 카드 k장 = O(k log n)
+# 기록은 덱마다 append-only 저널(~/.flash_learning/srs/<user>/<deck>.jsonl)로 남겨
+# 여러 프로세스(웹 pre-fork 워커)가 같은 파일에 동시에 추가해도 안전하다.
+# 추가와 압축(compact)은 옆의 <deck>.jsonl.lock 파일 잠금 안에서 하고, 다른 프로세스가 압축해 파일이 바뀌면
+# (inode/크기) 처음부터 다시 읽는다.
+from __future__ import annotations
+import os, re, json, time, heapq, random, threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+try:
+    import fcntl
+except ImportError:                 # 윈도우
+    fcntl = None
+    import msvcrt
+
+DAY = 86400.0
+AGAIN_DELAY = 600.0         # 틀린 카드는 10분 뒤 다시
+GRADE_AGAIN = 1             # 모름/다시
+GRADE_SEEN  = 4             # 노출 완료(기본 통과)
+SRS_DIR = os.environ.get("FLASH_SRS_DIR") or os.path.join(os.path.expanduser("~"), ".flash_learning", "srs")
+
+_SAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+def card_key(c: dict) -> str:
+    """덱 안에서 카드를 구분하는 키: "<category|domain>#<order_index>" (keyword 는 겹치는 카드가 있음).
+    order_index 가 없는 카드만 keyword"""
+    oi = c.get("order_index")
+    if oi is None: return c.get("keyword", "")
+    return f"{c.get('category') or c.get('domain') or ''}#{oi}"
+
+@dataclass
+class CardState:
+    ease: float = 2.5
+    interval: float = 0.0   # 일(day) 단위
+    due: float = 0.0        # epoch 초
+    reps: int = 0
+    lapses: int = 0
+
+def sm2(st: CardState, grade: int, now: float) -> CardState:
+    """SM-2 갱신. grade 0~5 (3 이상 통과). 아직 기한 전인 카드의 통과는 상태를 그대로 둠"""
+    grade = max(0, min(5, int(grade)))
+    if grade >= 3 and now < st.due:
+        return CardState(st.ease, st.interval, st.due, st.reps, st.lapses)     # 기한 전 통과는 간격을 늘리지 않음
+    if grade < 3:
+        reps, interval, lapses = 0, 0.0, st.lapses + 1
+        due = now + AGAIN_DELAY
+    else:
+        reps, lapses = st.reps + 1, st.lapses
+        interval = 1.0 if reps == 1 else 6.0 if reps == 2 else round(st.interval * st.ease, 2)
+        due = now + interval * DAY
+    ease = max(1.3, st.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    return CardState(round(ease, 3), interval, due, reps, lapses)
+
+@contextmanager
+def _file_lock(path: str):
+    """프로세스 간 배타 잠금 (path + ".lock")"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".lock", "a+b") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0); msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0); msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+class Scheduler:
+    """덱 하나에 대한 사용자별 복습 상태"""
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.states: dict[str, CardState] = {}
+        self._heap: list[tuple[float, str]] = []    # (due, key) — 갱신 시 새로 push, 옛 항목은 꺼낼 때 버림
+        self._offset = 0                            # 저널에서 읽은 위치 (다른 프로세스가 추가한 줄만 이어 읽음)
+        self._ident = None                          # 읽던 저널의 (dev, inode) — 압축으로 바뀌면 처음부터
+        self._lines = 0
+        self._lookup: tuple[object, int, dict] | None = None     # (덱 객체, 길이, 키→카드)
+        self._lock = threading.Lock()
+        self.refresh()
+
+    @classmethod
+    def open(cls, user: str, deck: str) -> "Scheduler":
+        return cls(os.path.join(SRS_DIR, _SAFE.sub("_", user or "local"), _SAFE.sub("_", deck) + ".jsonl"))
+
+    # ---- 저널 ----
+    def refresh(self):
+        """저널에 새로 추가된 줄만 반영"""
+        self._read()
+        if self._lines > 4 * len(self.states) + 1000:
+            self.compact()
+
+    def _read(self):
+        if not self.path: return
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with self._lock, f:
+            st = os.fstat(f.fileno())
+            ident = (st.st_dev, st.st_ino)
+            if ident != self._ident or st.st_size < self._offset:      # 다른 프로세스가 압축함 → 처음부터
+                self._ident, self._offset, self._lines = ident, 0, 0
+                self.states.clear(); self._heap.clear()
+            f.seek(self._offset)
+            for raw in f:
+                if not raw.endswith(b"\n"): break       # 쓰는 중인 마지막 줄은 다음에
+                self._offset += len(raw); self._lines += 1
+                try:
+                    r = json.loads(raw)
+                    self._set(r["k"], CardState(r["e"], r["i"], r["d"], r["r"], r["l"]))
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def compact(self):
+        """키당 마지막 상태 한 줄만 남기도록 저널 재작성 (파일 잠금 안에서 끝까지 읽은 뒤)"""
+        if not self.path: return
+        with _file_lock(self.path):
+            self._read()
+            with self._lock:
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    for k, st in self.states.items():
+                        f.write(self._record(k, st))
+                os.replace(tmp, self.path)
+                st = os.stat(self.path)
+                self._ident, self._offset, self._lines = (st.st_dev, st.st_ino), st.st_size, len(self.states)
+
+    @staticmethod
+    def _record(key: str, st: CardState) -> str:
+        return json.dumps({"k": key, "e": st.ease, "i": st.interval, "d": round(st.due, 1),
+                           "r": st.reps, "l": st.lapses}, ensure_ascii=False) + "\n"
+
+    def _set(self, key: str, st: CardState):
+        self.states[key] = st
+        heapq.heappush(self._heap, (st.due, key))
+
+    # ---- 복습 기록 / 조회 ----
+    def review(self, key: str, grade: int, now: float | None = None) -> CardState:
+        """복습 기록. 저널 끝까지 읽기 → SM-2 → 추가를 파일 잠금 하나 안에서 (다른 프로세스의 같은 카드 복습을 잃지 않게)"""
+        now = time.time() if now is None else now
+        if not self.path:
+            return self._apply(key, grade, now)[0]
+        with _file_lock(self.path):
+            self._read()
+            st, changed = self._apply(key, grade, now)
+            if changed:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(self._record(key, st))
+        if self._lines > 4 * len(self.states) + 1000:
+            self.compact()
+        return st
+
+    def _apply(self, key: str, grade: int, now: float) -> tuple[CardState, bool]:
+        """SM-2 를 적용 → (새 상태, 바뀌었는지). 바뀐 게 없으면 저널에 안 남김"""
+        with self._lock:
+            old = self.states.get(key) or CardState()
+            st = sm2(old, grade, now)
+            if st == old and key in self.states: return st, False
+            self._set(key, st)
+            return st, True
+
+    def due_keys(self, k: int, now: float | None = None, skip=()) -> list[str]:
+        """기한이 지난 키를 가장 밀린 순으로 최대 k개 (O(k log n))"""
+        now = time.time() if now is None else now
+        out, keep, got = [], [], set()
+        with self._lock:
+            h = self._heap
+            while h and len(out) < k and h[0][0] <= now:
+                due, key = heapq.heappop(h)
+                st = self.states.get(key)
+                if st is None or st.due != due or key in got: continue    # 옛/중복 항목 폐기
+                got.add(key); keep.append((due, key))
+                if key not in skip: out.append(key)
+            for item in keep: heapq.heappush(h, item)
+        return out
+
+    def resting(self, now: float | None = None, limit: int | None = None) -> set:
+        """아직 기한이 안 된(쉬게 둘) 카드 키. limit을 주면 기한이 가장 먼 것부터 limit개만"""
+        now = time.time() if now is None else now
+        items = [(st.due, k) for k, st in self.states.items() if st.due > now]
+        if limit is not None and len(items) > limit:
+            items = heapq.nlargest(max(0, limit), items)
+        return {k for _, k in items}
+
+    def _by_key(self, cards: list) -> dict:
+        lk = self._lookup
+        if lk is None or lk[0] is not cards or lk[1] != len(cards):
+            lk = (cards, len(cards), {card_key(c): c for c in cards})
+            self._lookup = lk
+            self._adopt_legacy(cards)
+        return lk[2]
+
+    def _adopt_legacy(self, cards: list):
+        """예전 저널(keyword 키)의 상태를 새 키로 옮김 (메모리만, 다음 복습/압축 때 새 키로 기록).
+        keyword 가 덱 안에서 겹치면 어느 카드의 기록인지 모르므로 버림"""
+        kw = {}
+        for c in cards:
+            k = c.get("keyword", "")
+            kw[k] = None if k in kw else c
+        with self._lock:
+            for k, c in kw.items():
+                if c is None or k not in self.states: continue
+                new = card_key(c)
+                if new != k and new not in self.states:
+                    self._set(new, self.states.pop(k))
+
+    def pick_due(self, cards: list, k: int, rng: random.Random | None = None,
+                 now: float | None = None, exclude=()) -> list:
+        """기한 지난 카드(밀린 순) → 새 카드(무작위) → 나머지(무작위) 순으로 k장"""
+        rng = rng or random.Random()
+        self.refresh()
+        by_key = self._by_key(cards)
+        k = min(k, len(cards))
+        out = [by_key[key] for key in self.due_keys(k, now, skip=exclude) if key in by_key]
+        chosen = {card_key(c) for c in out}
+        # 새 카드: 거절 샘플링 (새 카드가 많을수록 빠름)
+        for _ in range(4 * k + 32):
+            if len(out) >= k: break
+            c = cards[rng.randrange(len(cards))]
+            key = card_key(c)
+            if key in chosen or key in exclude or key in self.states: continue
+            out.append(c); chosen.add(key)
+        if len(out) < k:
+            rest = [c for c in cards if card_key(c) not in chosen]
+            rng.shuffle(rest)
+            rest.sort(key=lambda c: (card_key(c) in exclude, card_key(c) in self.states))
+            out += rest[:k - len(out)]
+        return out
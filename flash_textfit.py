@@ -0,0 +1,110 @@
+# flash_textfit.py — 카드 캔버스용 텍스트 맞춤 (글자 크기 자동 축소 + 줄바꿈), 결과는 LRU 캐시
+# fit(text, font, (w, h), metrics) → Layout(lines, font, line_h)
+#   - 요청한 크기부터 MIN_SIZE 까지 이분 탐색: 박스 폭에 맞게 단어 단위로 줄을 나눠(긴 단어/한글은 글자 단위) 높이가 들어가는 가장 큰 크기
+#   - "• " 로 시작하는 줄이 넘치면 이어지는 줄을 들여씀
+# 폭 측정은 (폰트, 단어) 마다 한 번 (TkMetrics), 레이아웃은 (텍스트, 폰트, 박스) 마다 한 번 → 같은 카드를 다시 그리거나
+# 전체화면을 오가도 측정 없이 캐시에서 꺼냄.
+from __future__ import annotations
+import re
+from collections import namedtuple
+from flash_repo import LRUCache
+
+MIN_SIZE = 10
+PAD = 0.94                      # 박스의 이 비율 안에 배치
+LAYOUT_CACHE = 512
+WORDS_PER_FONT = 20000          # 폰트별 단어 폭 캐시 상한 (넘으면 비움)
+
+Layout = namedtuple("Layout", "lines font line_h")
+LAYOUTS = LRUCache(LAYOUT_CACHE)
+
+_TOKEN = re.compile(r"\S+|\s+")
+
+class TkMetrics:
+    """tkinter.font 로 측정 (캔버스가 있는 창이 떠 있어야 함)"""
+    def __init__(self, root):
+        self.root = root
+        self._fonts: dict = {}          # 폰트 튜플 → (tkfont.Font, linespace, {단어: 폭})
+
+    def _font(self, font):
+        f = self._fonts.get(font)
+        if f is None:
+            import tkinter.font as tkfont
+            family, size, *style = font
+            tf = tkfont.Font(root=self.root, family=family, size=size,
+                             weight="bold" if "bold" in style else "normal",
+                             slant="italic" if "italic" in style else "roman")
+            f = self._fonts[font] = (tf, tf.metrics("linespace"), {})
+        return f
+
+    def width(self, font, s: str) -> int:
+        tf, _, words = self._font(font)
+        w = words.get(s)
+        if w is None:
+            if len(words) >= WORDS_PER_FONT: words.clear()
+            w = words[s] = tf.measure(s)
+        return w
+
+    def linespace(self, font) -> int:
+        return self._font(font)[1]
+
+def _with_size(font, size: int):
+    return (font[0], size, *font[2:])
+
+def _split_long(tok: str, font, first_w: float, rest_w: float, metrics) -> list:
+    """폭을 넘는 단어를 글자 단위로 자름 (첫 조각은 지금 줄의 남은 폭)"""
+    out, cur, limit = [], "", first_w
+    for ch in tok:
+        if cur and metrics.width(font, cur + ch) > limit:
+            out.append(cur); cur, limit = ch, rest_w
+        else:
+            cur += ch
+    if cur: out.append(cur)
+    return out
+
+def wrap(line: str, font, maxw: float, metrics) -> list:
+    """단어 단위 그리디 줄바꿈 (줄 폭 = 토큰 폭의 합)"""
+    if metrics.width(font, line) <= maxw: return [line]
+    indent = "  " if line.startswith("• ") else ""
+    ind_w = metrics.width(font, indent) if indent else 0
+    out, cur, cur_w = [], "", 0
+    for tok in _TOKEN.findall(line):
+        if tok.isspace():
+            if cur.strip(): cur += tok; cur_w += metrics.width(font, tok)
+            continue
+        w = metrics.width(font, tok)
+        if cur.strip() and cur_w + w > maxw:                # 다음 줄로
+            out.append(cur.rstrip()); cur, cur_w = indent, ind_w
+        if cur_w + w > maxw:                                # 한 줄에도 안 들어가는 단어
+            parts = _split_long(tok, font, maxw - cur_w, maxw - ind_w, metrics)
+            for part in parts[:-1]:
+                out.append(cur + part); cur, cur_w = indent, ind_w
+            tok = parts[-1]; w = metrics.width(font, tok)
+        cur += tok; cur_w += w
+    if cur.strip(): out.append(cur.rstrip())
+    return out or [""]
+
+def _layout(text: str, font, box, metrics) -> Layout:
+    w, h = box
+    maxw, maxh = w * PAD, h * PAD
+    paras = (text or "").split("\n")
+    def attempt(size):
+        f = _with_size(font, size)
+        lines = [ln for p in paras for ln in wrap(p, f, maxw, metrics)]
+        line_h = metrics.linespace(f)
+        return Layout(tuple(lines), f, line_h), line_h * len(lines) <= maxh
+    top = int(font[1])
+    best, ok = attempt(top)
+    if ok or top <= MIN_SIZE: return best
+    lo, hi = MIN_SIZE, top - 1                  # 들어가는 가장 큰 크기 (없으면 MIN_SIZE 로 넘치게)
+    best = attempt(MIN_SIZE)[0]
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        lay, ok = attempt(mid)
+        if ok: best, lo = lay, mid + 1
+        else: hi = mid - 1
+    return best
+
+def fit(text: str, font, box, metrics) -> Layout:
+    """(텍스트, 폰트, 박스) 레이아웃 (캐시)"""
+    key = (text, tuple(font), tuple(box))
+    return LAYOUTS.get_or_load(key, lambda: _layout(text, tuple(font), tuple(box), metrics))
@@ -0,0 +1,74 @@
+# flash_tones.py — 미리 만든 PCM 신호음을 오디오 스레드에서 재생 (UI 스레드를 막지 않음)
+# winsound.Beep 은 소리가 끝날 때까지 호출한 스레드를 멈추므로, 신호음은 WAV(16bit mono) 바이트로 한 번 만들어 두고
+# 작업 스레드가 winsound.PlaySound(SND_MEMORY) 로 재생한다. winsound 가 없으면(윈도우 외) 아무것도 안 함.
+from __future__ import annotations
+import io, math, wave, threading
+from array import array
+from collections import deque
+
+try:
+    import winsound
+except Exception:
+    winsound = None
+
+RATE = 22050
+FADE_MS = 8                     # 앞뒤 페이드 (클릭 소리 방지)
+QUEUE_MAX = 2
+
+def tone_pcm(freq: float, ms: int, volume: float = 0.5, rate: int = RATE) -> array:
+    n = int(rate * ms / 1000)
+    fade = max(1, int(rate * FADE_MS / 1000))
+    amp = 32767 * volume
+    step = 2 * math.pi * freq / rate
+    out = array("h", bytes(2 * n))
+    for i in range(n):
+        env = min(1.0, i / fade, (n - 1 - i) / fade)
+        out[i] = int(amp * env * math.sin(step * i))
+    return out
+
+def wav_bytes(*parts: array, rate: int = RATE) -> bytes:
+    """PCM 조각들을 이어 WAV 로 (PlaySound SND_MEMORY 용)"""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1); w.setsampwidth(2); w.setframerate(rate)
+        for p in parts:
+            w.writeframes(p.tobytes())
+    return buf.getvalue()
+
+class TonePlayer:
+    """이름 → WAV 바이트. play(name) 은 바로 반환, 재생은 오디오 스레드에서 (밀리면 오래된 것부터 버림)"""
+    def __init__(self, sounds: dict):
+        self.sounds = sounds
+        self.enabled = winsound is not None
+        self._q: deque = deque()
+        self._cv = threading.Condition()
+        self._thread = None
+
+    def play(self, name: str):
+        if not self.enabled or name not in self.sounds: return
+        with self._cv:
+            while len(self._q) >= QUEUE_MAX: self._q.popleft()
+            self._q.append(name)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="flash-audio", daemon=True)
+                self._thread.start()
+            self._cv.notify()
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while not self._q: self._cv.wait()
+                name = self._q.popleft()
+            try:
+                winsound.PlaySound(self.sounds[name], winsound.SND_MEMORY | winsound.SND_NODEFAULT)
+            except Exception:
+                pass
+
+def tone_player(spec: dict, volume: float = 0.5) -> TonePlayer:
+    """{이름: [(Hz, ms), ...]} → TonePlayer. 같은 (Hz, ms) 조각은 한 번만 생성, winsound 가 없으면 생성 안 함"""
+    if winsound is None: return TonePlayer({})
+    pcm: dict = {}
+    def part(f, ms):
+        if (f, ms) not in pcm: pcm[(f, ms)] = tone_pcm(f, ms, volume)
+        return pcm[(f, ms)]
+    return TonePlayer({name: wav_bytes(*(part(f, ms) for f, ms in seq)) for name, seq in spec.items()})
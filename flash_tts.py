@@ -0,0 +1,53 @@
+# flash_tts.py — 미리 합성한 TTS 클립 캐시 (내용 주소: 텍스트+보이스 해시)
+# build_tts_cache.py 가 만들고 flash_web.py 가 /tts/... 로 서빙한다.
+#   tts_cache/voices.json   {"en": 보이스 id, "ko": 보이스 id}  — 키 계산에 쓰인 보이스
+#   tts_cache/<키>.wav      키 = sha1(보이스 + "\n" + 정규화 텍스트) 앞 24자
+# 발화 문장은 웹 페이지의 speakEN/speakKO 와 같은 규칙으로 만든다 (텍스트가 같아야 키가 맞음).
+from __future__ import annotations
+import os, json, hashlib
+
+TTS_DIR = os.environ.get("FLASH_TTS_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "tts_cache")
+CLIP_EXT = ".wav"
+LANGS = ("en", "ko")
+
+def normalize(text: str) -> str:
+    return " ".join((text or "").split())
+
+def utterance_en(c: dict) -> str:
+    """웹 speakEN: 패턴이면 keyword + 예문 4개, 아니면 usage_one_liner → keyword"""
+    if c.get("category") == "pattern" and c.get("items"):
+        lines = [it.get("en") or "" for it in c["items"][:4]]
+        return normalize(". ".join([c.get("keyword") or ""] + lines))
+    return normalize(c.get("usage_one_liner") or c.get("keyword") or "")
+
+def utterance_ko(c: dict) -> str:
+    """웹 speakKO: meaning, 없으면 예문 한국어 3개"""
+    if c.get("meaning"): return normalize(c["meaning"])
+    return normalize(" ".join(it.get("ko") or "" for it in (c.get("items") or [])[:3]))
+
+def clip_key(text: str, voice: str) -> str:
+    return hashlib.sha1(f"{voice}\n{normalize(text)}".encode("utf-8")).hexdigest()[:24]
+
+def clip_path(key: str, root: str = TTS_DIR) -> str:
+    return os.path.join(root, key + CLIP_EXT)
+
+def voices_path(root: str = TTS_DIR) -> str:
+    return os.path.join(root, "voices.json")
+
+def load_voices(root: str = TTS_DIR) -> dict:
+    """{lang: 보이스 id} — 캐시를 아직 안 만들었으면 {}"""
+    try:
+        with open(voices_path(root), encoding="utf-8") as f:
+            v = json.load(f)
+        return v if isinstance(v, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def lookup(lang: str, text: str, voices: dict, root: str = TTS_DIR) -> tuple[str, str] | None:
+    """(키, 파일 경로) — 클립이 없으면 None"""
+    voice = voices.get(lang)
+    text = normalize(text)
+    if voice is None or not text: return None
+    key = clip_key(text, voice)
+    path = clip_path(key, root)
+    return (key, path) if os.path.exists(path) else None
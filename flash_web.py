@@ -1,26 +1,227 @@
 # flash_web.py — 모바일 브라우저용 웹앱 + PWA + TTS(영/한) + 명상 음성 안내
 # 실행:  py -3.13 -m pip install flask
 #        py -3.13 flash_web.py  → PC에서 http://127.0.0.1:7860 , 폰은 http://<PC-IP>:7860
+# 운영:  python3 flash_web.py --serve [--backend builtin|waitress|gunicorn] [--workers 4] [--keepalive 5]
 from __future__ import annotations
-import os, json, random
+import os, re, gc, sys, json, gzip, random, time, signal, argparse, hashlib, threading, mimetypes
+from dataclasses import dataclass
 from pathlib import Path
-from flask import Flask, request, send_from_directory, jsonify, render_template_string
+from flask import Flask, Response, request, send_from_directory, send_file, jsonify, g
+from flash_srs import Scheduler, card_key, GRADE_SEEN
+from flash_deckpack import PackedDeck
+import flash_repo as repo
+from flash_sampler import index_for, sample_english, list_page
+from flash_idset import IdSet
+import flash_search
+import flash_metrics as fm
+import flash_profile
+from flash_delta import DeckSnapshot, VERSIONS, diff as deck_diff
+import flash_tts
+from flash_repo import EN_FILES
 
 APP = Flask(__name__, static_folder="static")
 BASE = Path(__file__).parent.resolve()
 DATA = (BASE / "data").resolve()
 
-EN_FILES = {
-    "vocab": "english_vocab.json",
-    "coding": "english_coding.json",
-    "pattern": "english_pattern.json",
-    "conversation": "english_conversation.json",
-}
-
 def load_json(p: Path):
-    if not p.exists(): return []
-    with open(p, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return repo.load_path(str(p))
+
+# ---------- 메트릭 (/metrics, Prometheus 텍스트 포맷) ----------
+METRICS = fm.Registry()
+M_REQS = METRICS.counter("flash_http_requests_total", "HTTP requests by route template", ("route", "method", "status"))
+M_LATENCY = METRICS.histogram("flash_http_request_duration_seconds", "Request handling time", ("route",))
+M_BYTES = METRICS.counter("flash_http_response_bytes_total", "Response body bytes sent", ("route",))
+M_ASSET = METRICS.counter("flash_asset_responses_total", "Prebuilt asset responses (304 = client cache hit)", ("encoding", "status"))
+M_STORE = METRICS.counter("flash_store_lookups_total", "CardStore lookups (hit = served from memory)", ("result",))
+M_DECK_LOAD = METRICS.histogram("flash_deck_load_seconds", "Deck read + parse + compress time", ("file",))
+METRICS.counter_fn("flash_repo_cache_lookups_total", "flash_repo LRU lookups", lambda: {
+    ("hit",): repo.CACHE.hits, ("miss",): repo.CACHE.misses}, ("result",))
+METRICS.gauge("flash_repo_cache_entries", "flash_repo LRU entries", lambda: len(repo.CACHE))
+METRICS.gauge("flash_process_resident_memory_bytes", "Resident set size", fm.process_rss)
+START_TIME = time.time()
+METRICS.gauge("flash_process_start_time_seconds", "Process start (unix time)", lambda: START_TIME)
+
+@APP.before_request
+def _metrics_start():
+    g.t0 = time.perf_counter()
+
+@APP.after_request
+def _metrics_observe(resp):
+    route = request.url_rule.rule if request.url_rule else "<unmatched>"
+    t0 = g.get("t0")
+    if t0 is not None: M_LATENCY.observe(time.perf_counter() - t0, route)
+    M_REQS.inc(route, request.method, str(resp.status_code))
+    M_BYTES.inc(route, amount=resp.content_length or 0)
+    return resp
+
+# 요청별 프로파일 (FLASH_PROFILE=cprofile|sample 일 때만 훅 등록)
+if flash_profile.ENABLED:
+    PROFILER = flash_profile.shared_profiler("web")   # 요청 스레드 공용 (구간 수/통계는 프로세스에 하나)
+
+    @APP.before_request
+    def _profile_begin():
+        PROFILER.begin(request.path)
+
+    @APP.teardown_request
+    def _profile_end(exc):
+        PROFILER.end()
+
+# ---------- 미리 만든 응답 자산 (raw + gzip) ----------
+GZIP_TYPES = ("text/", "application/json", "application/javascript", "application/manifest+json")
+
+@dataclass
+class Asset:
+    raw: bytes
+    gz: bytes | None    # 압축 이득이 없거나 바이너리면 None
+    etag: str           # raw 기준 sha1, gzip 변형은 "-gz" 접미사
+    mimetype: str
+
+def make_asset(body: bytes, mimetype: str) -> Asset:
+    gz = None
+    if mimetype.startswith(GZIP_TYPES):
+        gz = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(gz) >= len(body): gz = None
+    return Asset(body, gz, hashlib.sha1(body).hexdigest(), mimetype)
+
+def asset_hash(a: Asset) -> str:
+    """자산 매니페스트/해시 URL(?v=)에 쓰는 짧은 내용 해시"""
+    return a.etag[:16]
+
+def send_asset(a: Asset) -> Response:
+    """Accept-Encoding에 따라 raw/gzip 중 하나를 고르고 ETag/304 처리.
+    ?v=<내용 해시> 가 현재 내용과 맞으면 영구 캐시(immutable) — 내용이 바뀌면 URL이 바뀐다."""
+    use_gz = a.gz is not None and request.accept_encodings["gzip"] > 0
+    etag = a.etag + "-gz" if use_gz else a.etag
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+        M_ASSET.inc("gzip" if use_gz else "identity", "304")
+    else:
+        M_ASSET.inc("gzip" if use_gz else "identity", "200")
+        resp = Response(a.gz if use_gz else a.raw, mimetype=a.mimetype)
+        if use_gz: resp.headers["Content-Encoding"] = "gzip"
+    resp.set_etag(etag)
+    resp.vary.add("Accept-Encoding")
+    if request.args.get("v") == asset_hash(a):
+        resp.cache_control.public = True
+        resp.cache_control.max_age = 31536000
+        resp.cache_control.immutable = True
+    else:
+        resp.cache_control.no_cache = True
+    return resp
+
+def minify_html(src: str) -> str:
+    """줄 단위 축약: 들여쓰기/빈 줄/한 줄짜리 주석 제거 (줄바꿈은 유지해서 JS 안전)"""
+    out = []
+    for ln in src.splitlines():
+        ln = ln.strip()
+        if not ln or ln.startswith("//") or re.fullmatch(r"/\*.*\*/", ln): continue
+        out.append(ln)
+    return "\n".join(out)
+
+# ---------- 프로세스 공용 카드 저장소 ----------
+@dataclass
+class StoreEntry:
+    stamp: tuple        # (mtime_ns, size) — 바뀌면 다시 읽음
+    asset: Asset        # /data 응답용 (JSON은 compact 직렬화본)
+    cards: list | PackedDeck | None  # 카드 덱이면 파싱 결과 (카드 id = 파일 내 위치)
+    snap: DeckSnapshot | None = None  # 카드 해시 + 덱 버전 (델타 동기화용)
+
+class CardStore:
+    """data/ 파일을 한 번만 읽고 파싱해 보관. mtime/size가 바뀔 때만 다시 읽는다."""
+    def __init__(self, root: Path, check_interval: float = 1.0, parse: bool = True, types: dict | None = None):
+        self.root = root
+        self.check_interval = check_interval    # stat 최소 간격(초) — 동시 접속 시 stat 폭주 방지
+        self.parse = parse                      # False면 JSON도 바이트 그대로 (덱이 아닌 정적 파일용)
+        self.types = types or {}                # 파일 이름 → MIME (확장자로 못 맞추는 것)
+        self._entries: dict[str, StoreEntry] = {}
+        self._checked: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, fname: str) -> StoreEntry | None:
+        now = time.monotonic()
+        e = self._entries.get(fname)
+        if e is not None and now - self._checked.get(fname, 0.0) < self.check_interval:
+            M_STORE.inc("hit")
+            return e
+        p = (self.root / fname).resolve()
+        if not p.is_relative_to(self.root):
+            return None
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        if e is None or e.stamp != stamp:
+            with self._lock:
+                e = self._entries.get(fname)
+                if e is None or e.stamp != stamp:
+                    t0 = time.perf_counter()
+                    e = self._load(p, stamp)
+                    self._entries[fname] = e
+                    M_DECK_LOAD.observe(time.perf_counter() - t0, fname)
+                    M_STORE.inc("load")
+                else:
+                    M_STORE.inc("hit")
+        else:
+            M_STORE.inc("hit")
+        self._checked[fname] = now
+        return e
+
+    def warm(self):
+        """시작 시 모든 JSON 덱을 미리 파싱/압축"""
+        for p in sorted(self.root.glob("*.json")):
+            self.get(p.name)
+
+    def _load(self, p: Path, stamp: tuple) -> StoreEntry:
+        cards = None
+        if p.suffix == ".json" and self.parse:
+            # 공용 저장소 경유 (.fdk가 더 새것이면 mmap — pre-fork 워커끼리 페이지 캐시를 공유)
+            cards = repo.load_path(str(p))
+            # indent=2 원본 대신 공백 없는 직렬화본을 서빙
+            doc = list(cards) if isinstance(cards, PackedDeck) else cards
+            body = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            if isinstance(cards, dict): cards = None
+        else:
+            body = p.read_bytes()
+        snap = None
+        if cards is not None:
+            snap = DeckSnapshot.of(cards)
+            VERSIONS.record(p.name, snap)       # 이 버전을 기준으로 한 델타 요청에 대비
+        mimetype = self.types.get(p.name) or mimetypes.guess_type(p.name)[0] or "application/octet-stream"
+        return StoreEntry(stamp, make_asset(body, mimetype), cards, snap)
+
+STORE = CardStore(DATA)
+# 루트의 PWA 정적 파일 (고정 이름으로만 조회)
+ROOT_FILES = CardStore(BASE, parse=False, types={"manifest.webmanifest.json": "application/manifest+json"})
+PWA_FILES = {"/manifest.webmanifest": "manifest.webmanifest.json", "/icon-192.png": "icon-192.png", "/icon-512.png": "icon-512.png"}
+
+# ---------- 서버측 덱 샘플링 ----------
+def get_deck(cat: str) -> list:
+    """카테고리 덱 (저장소 캐시 사용, 파일이 바뀌면 자동 재로드)"""
+    e = STORE.get(EN_FILES[cat])
+    if e is None or e.cards is None: return []
+    if e.cards and "category" not in e.cards[0]:
+        for c in e.cards: c.setdefault("category", cat)
+    return e.cards
+
+MAX_EXCLUDE = 5000                      # ?exclude= 로 받는 id 수 상한
+
+def parse_ids(s: str, n: int) -> set:
+    """"1,5,9" → 0 <= id < n 인 id (앞에서부터 MAX_EXCLUDE 개까지)"""
+    out = set()
+    for x in (s or "").split(",", MAX_EXCLUDE)[:MAX_EXCLUDE]:
+        x = x.strip()
+        if x.isascii() and x.isdigit() and len(x) <= 9 and int(x) < n: out.add(int(x))
+    return out
+
+# ---------- 간격 반복 (사용자별 스케줄러) ----------
+_SAFE_USER = re.compile(r"[A-Za-z0-9_-]{1,64}")
+SCHED_CACHE = 256                       # 메모리에 둘 (사용자, 카테고리) 스케줄러 수 (밀려나면 다음에 저널에서 다시 읽음)
+_SCHEDS = repo.LRUCache(SCHED_CACHE)
+
+def get_sched(user: str | None, cat: str) -> Scheduler | None:
+    if not user or not _SAFE_USER.fullmatch(user): return None
+    return _SCHEDS.get_or_load((user, cat), lambda: Scheduler.open(user, f"english_{cat}"))
 
 HTML = r"""
 <!doctype html>
@@ -73,6 +274,8 @@ HTML = r"""
     </select>
     <label>장수</label>
     <input id="page" type="number" min="10" max="60" step="5" value="30">
+    <label><input id="seq" type="checkbox"> 순서대로</label>
+    <label><input id="srs" type="checkbox"> 간격 반복</label>
     <button id="start">3회 루프 시작</button>
   </div>
   <p class="sub">영어는 라운드마다 <b>랜덤</b>, 세션 전체에서 <b>중복 최소화</b>. 라운드 사이 <b>2분 명상</b>. <span id="pwa-hint" class="hidden">설치하려면 브라우저 메뉴에서 “홈 화면에 추가”</span></p>
@@ -96,6 +299,7 @@ HTML = r"""
     <input id="interval" type="range" min="0.5" max="5" step="0.1" value="1.2">
     <button id="toggle">▶ 자동</button>
     <button id="next">다음</button>
+    <button id="again">다시</button>
     <button id="speakEN">🔊 EN</button>
     <button id="speakKO">🔊 KO</button>
     <label class="sub"><input type="checkbox" id="autoTTS" checked> 자동 읽기</label>
@@ -143,20 +347,75 @@ const phaseEl=$("#phase"), leftEl=$("#left"), circle=$("#circle");
 const coach=$("#coach");
 const pwaHint=$("#pwa-hint");
 
-let allCards=[], deck=[], idx=0, roundNo=1, page=30, auto=false, last=0, seen=new Set();
+const uid = localStorage.getItem("flUid") || (()=>{ const u=Math.random().toString(36).slice(2,12); localStorage.setItem("flUid", u); return u; })();
+// 본 카드 id 비트셋 (서버 flash_idset.IdSet 과 같은 base64url 형식)
+class Bits{
+  constructor(){ this.b = new Uint8Array(0); }
+  add(i){
+    const q = i >> 3;
+    if(q >= this.b.length){ const nb = new Uint8Array(Math.max(q+1, this.b.length*2)); nb.set(this.b); this.b = nb; }
+    this.b[q] |= 1 << (i & 7);
+  }
+  has(i){ const q = i >> 3; return q < this.b.length && ((this.b[q] >> (i & 7)) & 1) === 1; }
+  toB64(){
+    let n = this.b.length; while(n && !this.b[n-1]) n--;
+    let s = ""; for(let i=0;i<n;i++) s += String.fromCharCode(this.b[i]);
+    return btoa(s).replace(/\+/g,"-").replace(/\//g,"_").replace(/=+$/,"");
+  }
+}
+let deck=[], idx=0, roundNo=1, page=30, auto=false, last=0, seen=new Bits();
+let seqCursor = "";   // 순차 모드: 다음 페이지 커서 (/api/cards)
 let voices=[], voiceMap=new Map();
 
-function shuffle(a){ for(let i=a.length-1;i>0;i--){const j=Math.floor(Math.random()*(i+1)); [a[i],a[j]]=[a[j],a[i]];} return a; }
-function pickEnglish(cards, seenSet, k){
-  const unseen = cards.filter(c=>!seenSet.has(c.keyword));
-  let out = [];
-  if(unseen.length>=k){ out = shuffle(unseen.slice()).slice(0,k); }
-  else {
-    out = unseen.slice();
-    const rest = cards.filter(c=>!out.some(x=>x.keyword===c.keyword));
-    out = out.concat(shuffle(rest).slice(0, Math.min(k-out.length, rest.length)));
+// 서버에서 k장만 뽑아 받음 (본 카드 id 비트셋은 seen으로 전달). 오프라인이면 캐시된 해시 덱에서 직접 뽑음
+async function fetchDeck(cat, k, seenBits){
+  if($("#seq").checked) return fetchSeq(cat, k);
+  const q = new URLSearchParams({cat, page:String(k), seen:seenBits.toB64()});
+  if($("#srs").checked){ q.set("srs", "1"); q.set("user", uid); }
+  try{
+    const res = await fetch("/api/deck?" + q.toString());
+    if(!res.ok) throw new Error("HTTP " + res.status);
+    const data = await res.json();
+    return data.cards || [];
+  }catch(err){
+    return offlineDeck(cat, k, seenBits);
+  }
+}
+// 순차 모드: order_index 순으로 이어서 (끝나면 처음부터)
+async function fetchSeq(cat, k){
+  const q = new URLSearchParams({domain:"english", level:cat, limit:String(k), cursor:seqCursor});
+  const data = await (await fetch("/api/cards?" + q.toString())).json();
+  seqCursor = data.next_cursor || "";
+  return data.cards || [];
+}
+
+// 기기에 덱 사본 보관: 가진 버전 이후 바뀐 카드만 받아 갱신 (/api/deck/delta)
+function localDeck(cat){
+  try{ return JSON.parse(localStorage.getItem("deck:" + cat) || "null"); }catch(e){ return null; }
+}
+async function syncDeck(cat){
+  let local = localDeck(cat);
+  const q = new URLSearchParams({cat, since: local ? local.version : ""});
+  const d = await (await fetch("/api/deck/delta?" + q.toString())).json();
+  if(d.error || d.version === (local && local.version)) return local;
+  let cards = d.cards;
+  if(!d.full){
+    cards = new Array(d.total);
+    for(const [ns, os, n] of d.copy){ for(let i=0;i<n;i++){ const c = local.cards[os+i]; c.id = ns+i; cards[ns+i] = c; } }
+    for(const c of d.added.concat(d.changed)) cards[c.id] = c;
   }
-  return out.slice(0,k);
+  local = {version: d.version, cards};
+  try{ localStorage.setItem("deck:" + cat, JSON.stringify(local)); }catch(e){}
+  return local;
+}
+async function offlineDeck(cat, k, seenBits){
+  const local = localDeck(cat);
+  const cards = local ? local.cards : await (await fetch((await (await fetch("/asset-manifest.json")).json()).decks[cat])).json();
+  const fresh = [], rest = [];
+  cards.forEach((c,i)=>{ if(c.id==null) c.id = i; if(!c.category) c.category = cat; (seenBits.has(c.id) ? rest : fresh).push(c); });
+  const pick = (arr, n)=>{ for(let i=0;i<Math.min(n, arr.length);i++){ const j = i + Math.floor(Math.random()*(arr.length-i)); [arr[i], arr[j]] = [arr[j], arr[i]]; } return arr.slice(0, n); };
+  const out = pick(fresh, k);
+  return out.concat(pick(rest, k - out.length));
 }
 
 function setFonts(base){
@@ -184,20 +443,11 @@ function render(){
   }
 }
 
-async function loadCategory(cat){
-  const map = {"vocab":"english_vocab.json","coding":"english_coding.json","pattern":"english_pattern.json","conversation":"english_conversation.json"};
-  const url = "/data/" + map[cat];
-  const res = await fetch(url);
-  const data = await res.json();
-  data.forEach(d=>{ if(!d.category) d.category=cat; });
-  return data;
-}
-
 async function startLoop(){
   const cat = catSel.value; page = parseInt(pageInp.value||"30");
-  allCards = await loadCategory(cat);
-  seen = new Set(); roundNo = 1;
-  deck = pickEnglish(allCards, seen, page);
+  seen = new Bits(); roundNo = 1; seqCursor = "";
+  deck = await fetchDeck(cat, page, seen);
+  syncDeck(cat).catch(()=>{});
   idx = 0;
   screenSelect.classList.add("hidden");
   screenRest.classList.add("hidden");
@@ -234,11 +484,11 @@ function runRest(sec){
   requestAnimationFrame(step);
 }
 
-function nextRound(){
+async function nextRound(){
   roundNo++;
   if(roundNo<=3){
     const cat = catSel.value;
-    deck = pickEnglish(allCards, seen, page);
+    deck = await fetchDeck(cat, page, seen);
     idx = 0;
     screenStudy.classList.remove("hidden");
     render();
@@ -262,15 +512,24 @@ btnToggle.addEventListener("click", ()=>{
   last = performance.now()/1000.0;
 });
 
-btnNext.addEventListener("click", ()=>{
+// 간격 반복 기록 (4=봤음, 1=다시)
+function review(c, grade){
+  if(!$("#srs").checked) return;
+  fetch("/api/review", {method:"POST", keepalive:true, headers:{"Content-Type":"application/json"},
+    body: JSON.stringify({user:uid, cat:catSel.value, id:c.id, grade})}).catch(()=>{});
+}
+function advance(grade){
   if(!deck.length) return;
-  seen.add(deck[idx].keyword||"");
+  seen.add(deck[idx].id);
+  review(deck[idx], grade);
   if(idx < deck.length-1){
     idx++; render();
   }else{
     toRest();
   }
-});
+}
+btnNext.addEventListener("click", ()=>advance(4));
+$("#again").addEventListener("click", ()=>advance(1));
 
 // ---------- TTS ----------
 function fillVoices(){
@@ -292,7 +551,25 @@ fillVoices();
 if('speechSynthesis' in window){
   window.speechSynthesis.onvoiceschanged = fillVoices;
 }
+// 서버에 미리 합성한 클립이 있으면 그것을 재생, 없거나 실패하면 브라우저 음성 합성
+let ttsLangs = new Set();
+fetch("/api/tts").then(r=>r.json()).then(d=>{ ttsLangs = new Set(d.langs || []); }).catch(()=>{});
+const clip = new Audio();
 function speak(text, langHint){
+  if(!text) return;
+  const lang = langHint || "en";
+  if(ttsLangs.has(lang)){
+    if('speechSynthesis' in window) window.speechSynthesis.cancel();
+    clip.pause();
+    clip.src = "/tts/" + lang + "?" + new URLSearchParams({text}).toString();
+    clip.playbackRate = parseFloat(rate.value||"1.0");
+    clip.volume = parseFloat(volume.value||"1.0");
+    clip.play().catch(err=>{ if(err.name !== "AbortError") speakSynth(text, langHint); });
+    return;
+  }
+  speakSynth(text, langHint);
+}
+function speakSynth(text, langHint){
   if(!('speechSynthesis' in window)) return;
   if(!text) return;
   const u = new SpeechSynthesisUtterance(text);
@@ -306,7 +583,7 @@ function speak(text, langHint){
     const found = voices.find(v => v.lang.toLowerCase().startsWith(langHint||"en"));
     if(found) u.voice = found;
   }
-  window.speechSynthesis.cancel(); // 겹침 방지
+  clip.pause(); window.speechSynthesis.cancel(); // 겹침 방지
   window.speechSynthesis.speak(u);
 }
 function speakEN(){
@@ -351,37 +628,374 @@ if('serviceWorker' in navigator){
 </html>
 """
 
+# 템플릿 변수가 없으므로 시작 시 한 번만 축약/압축
+PAGE = make_asset(minify_html(HTML).encode("utf-8"), "text/html; charset=utf-8")
+
 @APP.route("/")
 def index():
-    return render_template_string(HTML)
+    return send_asset(PAGE)
 
 @APP.route("/data/<path:fname>")
 def data(fname):
-    # data/ 하위 JSON 제공
-    p = (DATA / fname).resolve()
-    if not str(p).startswith(str(DATA)) or not p.exists():
+    # data/ 하위 JSON 제공 (메모리 캐시 + compact/gzip + ETag/304)
+    e = STORE.get(fname)
+    if e is None:
+        return jsonify({"error":"not found"}), 404
+    return send_asset(e.asset)
+
+@APP.route("/api/deck")
+def api_deck():
+    # 서버에서 k장만 샘플링: ?cat=vocab&page=30&seed=42&seen=<id 비트셋 base64url> (예전 형식 exclude=1,5,9 도 받음)
+    # 간격 반복은 &srs=1&user=<id> 일 때만
+    cat = request.args.get("cat", "vocab")
+    if cat not in EN_FILES:
+        return jsonify({"error":"unknown category"}), 400
+    try:
+        k = max(1, min(200, int(request.args.get("page", 30))))
+        seed = request.args.get("seed")
+        rng = random.Random(int(seed) if seed not in (None, "") else None)
+    except ValueError:
+        return jsonify({"error":"bad page/seed"}), 400
+    try:
+        seen = IdSet.from_b64(request.args.get("seen", ""))
+    except ValueError:
+        return jsonify({"error":"bad seen"}), 400
+    deck = get_deck(cat)
+    seen = seen.below(len(deck)) | parse_ids(request.args.get("exclude", ""), len(deck))
+    sched = get_sched(request.args.get("user"), cat) if request.args.get("srs") == "1" else None
+    if sched:
+        # 간격 반복: 기한 지난 카드 → 새 카드 → 나머지
+        keys = {card_key(deck[i]) for i in seen}
+        cards = sched.pick_due(deck, k, rng=rng, exclude=keys)
+    else:
+        cards = [deck[i] for i in sample_english(index_for(deck), seen, k, rng)]
+    e = STORE.get(EN_FILES[cat])
+    return jsonify({"cat": cat, "total": len(deck), "version": e.snap.version if e and e.snap else None, "cards": cards})
+
+@APP.route("/api/cards")
+def api_cards():
+    # 순차 목록 (order_index 순 커서 페이지): ?domain=python&level=1&cursor=<next_cursor>&limit=30
+    # level: 숫자 / master, 영어는 domain=english&level=vocab
+    domain = request.args.get("domain", "english")
+    level = request.args.get("level", "vocab")
+    try:
+        limit = max(1, min(200, int(request.args.get("limit", 30))))
+    except ValueError:
+        return jsonify({"error":"bad limit"}), 400
+    if domain == "english":
+        if level not in EN_FILES:
+            return jsonify({"error":"unknown category"}), 400
+        deck = get_deck(level)
+    elif domain in ("python", "pandas", "mysql") and (level == "master" or level.isdigit()):
+        deck = repo.load_master(domain) if level == "master" else repo.load_level(domain, int(level))
+    else:
+        return jsonify({"error":"unknown deck"}), 400
+    try:
+        cards, nxt = list_page(deck, request.args.get("cursor") or None, limit)
+    except ValueError:
+        return jsonify({"error":"bad cursor"}), 400
+    return jsonify({"domain": domain, "level": level, "total": len(deck), "cards": cards, "next_cursor": nxt})
+
+# ---------- 미리 합성한 TTS 클립 (build_tts_cache.py) ----------
+_TTS_VOICES: tuple = (None, {})         # (voices.json stamp, {lang: 보이스})
+
+def tts_voices() -> dict:
+    """voices.json (바뀌면 다시 읽음)"""
+    global _TTS_VOICES
+    try:
+        st = os.stat(flash_tts.voices_path()); stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return {}
+    if _TTS_VOICES[0] != stamp:
+        _TTS_VOICES = (stamp, flash_tts.load_voices())
+    return _TTS_VOICES[1]
+
+def send_clip(key: str, path: str, immutable: bool) -> Response:
+    # send_file(conditional=True): ETag/304 + Range(206) 처리
+    resp = send_file(path, mimetype="audio/wav", conditional=True, etag=key,
+                     max_age=31536000 if immutable else 86400)
+    if immutable: resp.cache_control.immutable = True
+    return resp
+
+@APP.route("/api/tts")
+def api_tts():
+    # 클라이언트가 클립 재생을 시도할지 결정 (없으면 speechSynthesis만)
+    voices = tts_voices()
+    return jsonify({"available": bool(voices), "langs": sorted(voices)})
+
+@APP.route("/tts/<lang>")
+def tts_clip(lang):
+    # ?text=... → 이 서버의 보이스로 만든 클립 (텍스트+보이스 해시로 찾음)
+    hit = flash_tts.lookup(lang, request.args.get("text", ""), tts_voices())
+    if hit is None:
+        return jsonify({"error":"no clip"}), 404
+    return send_clip(*hit, immutable=False)
+
+@APP.route("/tts/clip/<key>.wav")
+def tts_clip_by_key(key):
+    # 내용 주소 그대로 (키가 같으면 내용도 같음 → 영구 캐시)
+    if not re.fullmatch(r"[0-9a-f]{24}", key):
+        return jsonify({"error":"not found"}), 404
+    path = flash_tts.clip_path(key)
+    if not os.path.exists(path):
         return jsonify({"error":"not found"}), 404
-    return send_from_directory(DATA, fname)
+    return send_clip(key, path, immutable=True)
+
+@APP.route("/api/deck/delta")
+def api_deck_delta():
+    # 델타 동기화: ?cat=vocab&since=<가진 덱 버전> → copy 구간 + added/changed 카드 + removed id (모르는 버전이면 full)
+    cat = request.args.get("cat", "vocab")
+    if cat not in EN_FILES:
+        return jsonify({"error":"unknown category"}), 400
+    deck = get_deck(cat)
+    e = STORE.get(EN_FILES[cat])
+    if e is None or e.snap is None:
+        return jsonify({"error":"not found"}), 404
+    since = request.args.get("since", "")
+    out = {"cat": cat, "version": e.snap.version, "since": since, "total": len(deck)}
+    old = VERSIONS.get(EN_FILES[cat], since) if since else None
+    if old is None:
+        out.update(full=True, cards=list(deck))
+    else:
+        d = deck_diff(old, e.snap)
+        out.update(full=False, copy=d["copy"], removed=d["removed"],
+                   added=[deck[j] for j in d["added"]], changed=[deck[j] for j in d["changed"]])
+    return jsonify(out)
+
+@APP.route("/metrics")
+def metrics():
+    # 이 프로세스의 카운터/히스토그램 (Prometheus 텍스트 포맷 0.0.4)
+    return Response(METRICS.render(), content_type=fm.CONTENT_TYPE)
+
+@APP.route("/api/search")
+def api_search():
+    # 전체 덱 검색: ?q=필요해&limit=20&deck=english_pattern (색인은 시작 시 한 번 생성)
+    q = request.args.get("q", "").strip()
+    try:
+        limit = max(1, min(100, int(request.args.get("limit", 20))))
+    except ValueError:
+        return jsonify({"error":"bad limit"}), 400
+    hits = flash_search.search(q, limit, request.args.get("deck") or None)
+    return jsonify({"q": q, "results": [{"deck": d, "score": s, "card": c} for s, d, c in hits]})
+
+@APP.route("/api/review", methods=["POST"])
+def api_review():
+    # 카드 한 장 복습 기록: {"user":..., "cat":"vocab", "id":12, "grade":4}
+    body = request.get_json(silent=True) or {}
+    cat = body.get("cat")
+    sched = get_sched(body.get("user"), cat) if cat in EN_FILES else None
+    deck = get_deck(cat) if sched else []
+    try:
+        i = int(body.get("id"))
+        if i < 0: raise IndexError(i)
+        card = deck[i]
+        grade = int(body.get("grade", GRADE_SEEN))
+    except (TypeError, ValueError, IndexError):
+        return jsonify({"error":"bad review"}), 400
+    st = sched.review(card_key(card), grade)
+    return jsonify({"id": card["id"], "due": st.due, "interval": st.interval, "ease": st.ease})
+
+# ---------- PWA: 내용 해시 매니페스트 + 생성된 service worker ----------
+# 모든 자산은 /경로?v=<내용 해시> 로 캐시-우선. 매니페스트가 바뀌면 sw.js 바이트도 바뀌어 브라우저가 새 워커를 설치하고,
+# 새 워커는 해시가 바뀐 URL만 받아오고 목록에서 빠진 URL만 지운다.
+SW_TEMPLATE = r"""// generated by flash_web.py — do not edit
+const MANIFEST = __MANIFEST__;
+const CACHE = "flash-assets";
+const HASHED = new Set(Object.values(MANIFEST.assets));
+const PAGE = MANIFEST.assets["/"];
+
+self.addEventListener("install", e=>{
+  e.waitUntil(caches.open(CACHE).then(async c=>{
+    for(const url of HASHED){ if(!(await c.match(url))) await c.add(url); }
+    await c.add("/asset-manifest.json");      // 오프라인 덱 선택용 (워커가 바뀔 때마다 갱신)
+  }).then(()=>self.skipWaiting()));
+});
+self.addEventListener("activate", e=>{
+  e.waitUntil((async ()=>{
+    for(const k of await caches.keys()){ if(k!==CACHE) await caches.delete(k); }
+    const c = await caches.open(CACHE);
+    for(const req of await c.keys()){
+      const u = new URL(req.url);
+      if(u.pathname.startsWith("/api/")) continue;
+      if(u.search && !HASHED.has(u.pathname + u.search)) await c.delete(req);
+    }
+    await self.clients.claim();
+  })());
+});
+self.addEventListener("fetch", e=>{
+  const req = e.request, u = new URL(req.url);
+  if(req.method !== "GET" || u.origin !== location.origin || u.pathname.startsWith("/api/")) return;
+  const key = req.mode === "navigate" && u.pathname === "/" ? PAGE : u.pathname + u.search;
+  if(HASHED.has(key)){
+    // 해시 자산: 캐시 우선 (네트워크 요청 없음)
+    e.respondWith(caches.match(key).then(r=> r || fetch(key).then(r=>{
+      const copy = r.clone(); caches.open(CACHE).then(c=>c.put(key, copy)); return r;
+    })));
+    return;
+  }
+  // 그 밖(매니페스트 등): 네트워크 우선, 실패하면 캐시
+  e.respondWith(fetch(req).then(r=>{
+    if(r.status === 200){ const copy = r.clone(); caches.open(CACHE).then(c=>c.put(req, copy)); }
+    return r;
+  }).catch(()=>caches.match(req)));
+});
+"""
 
-# PWA 정적 파일 라우팅
-@APP.route("/manifest.webmanifest")
-def manifest():
-    return send_from_directory(APP.static_folder, "manifest.webmanifest")
+_MANIFEST_LOCK = threading.Lock()
+_MANIFEST: tuple = ((), None, None)      # (자산 해시 키, 매니페스트 자산, sw.js 자산)
+
+def asset_manifest() -> tuple[Asset, Asset]:
+    """(asset-manifest.json, sw.js) — 자산 내용이 바뀔 때만 다시 만든다"""
+    global _MANIFEST
+    assets = {"/": PAGE}
+    for url, fname in PWA_FILES.items():
+        e = ROOT_FILES.get(fname)
+        if e is not None: assets[url] = e.asset
+    for p in sorted(DATA.glob("*.json")):
+        e = STORE.get(p.name)
+        if e is None: continue
+        assets[f"/data/{p.name}"] = e.asset
+    key = tuple((url, a.etag) for url, a in assets.items())
+    with _MANIFEST_LOCK:
+        if _MANIFEST[0] == key:
+            return _MANIFEST[1], _MANIFEST[2]
+        hashed = {url: f"{url}?v={asset_hash(a)}" for url, a in assets.items()}
+        decks = {}
+        for cat, fname in EN_FILES.items():
+            if f"/data/{fname}" in hashed: decks[cat] = hashed[f"/data/{fname}"]
+        version = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        doc = {"version": version, "assets": hashed, "decks": decks}
+        body = json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+        man = make_asset(body.encode("utf-8"), "application/json")
+        sw_js = make_asset(SW_TEMPLATE.replace("__MANIFEST__", body).encode("utf-8"), "application/javascript")
+        _MANIFEST = (key, man, sw_js)
+        return man, sw_js
+
+@APP.route("/asset-manifest.json")
+def manifest_json():
+    return send_asset(asset_manifest()[0])
 
 @APP.route("/sw.js")
 def sw():
-    # service worker는 올바른 MIME을 위해 별도 라우팅
-    return send_from_directory(APP.static_folder, "sw.js")
+    # 매니페스트를 심어 만든 service worker (자산이 바뀌면 내용도 바뀜)
+    return send_asset(asset_manifest()[1])
+
+@APP.route("/manifest.webmanifest")
+@APP.route("/icon-192.png")
+@APP.route("/icon-512.png")
+def pwa_file():
+    e = ROOT_FILES.get(PWA_FILES[request.path])
+    if e is None:
+        return jsonify({"error":"not found"}), 404
+    return send_asset(e.asset)
 
 @APP.route("/static/<path:fname>")
 def static_files(fname):
     return send_from_directory(APP.static_folder, fname)
 
+# ---------- 운영 서버 모드 (--serve) ----------
+# 모든 백엔드는 덱을 먼저 읽어 둔 뒤(fork 전) 워커를 띄우므로 워커들이 파싱 결과를 공유한다.
+def serve_builtin(host: str, port: int, workers: int, threads: int, keepalive: int):
+    """표준 라이브러리 wsgiref + 연결당 스레드 + pre-fork + keep-alive (추가 설치 없이 오프라인 동작, Linux)"""
+    from http.server import BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+    from wsgiref.simple_server import WSGIServer, WSGIRequestHandler, ServerHandler, make_server
+
+    class KeepAliveServerHandler(ServerHandler):
+        http_version = "1.1"
+        def cleanup_headers(self):
+            super().cleanup_headers()
+            if "Content-Length" not in self.headers:    # 길이를 모르면 이 응답 뒤 연결 종료
+                self.headers["Connection"] = "close"
+                self.request_handler.close_connection = True
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"
+        timeout = keepalive                             # 유휴 연결 유지 시간(초)
+
+        def handle(self):
+            BaseHTTPRequestHandler.handle(self)         # close_connection 될 때까지 요청 반복
+
+        def handle_one_request(self):
+            try:
+                self.raw_requestline = self.rfile.readline(65537)
+            except TimeoutError:
+                self.close_connection = True; return
+            if not self.raw_requestline:
+                self.close_connection = True; return
+            if len(self.raw_requestline) > 65536:
+                self.requestline = self.request_version = self.command = ""
+                self.send_error(414); return
+            if not self.parse_request(): return
+            handler = KeepAliveServerHandler(self.rfile, self.wfile, self.get_stderr(), self.get_environ(),
+                                             multithread=True)
+            handler.request_handler = self
+            handler.run(self.server.get_app())
+
+    class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+        allow_reuse_address = True
+
+    srv = make_server(host, port, APP, server_class=ThreadingWSGIServer, handler_class=KeepAliveHandler)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    gc.freeze()                         # fork 후 GC가 공유 페이지를 건드리지 않도록
+    children = []
+    for _ in range(max(1, workers) - 1 if hasattr(os, "fork") else 0):
+        pid = os.fork()
+        if pid == 0:
+            try: srv.serve_forever()
+            finally: os._exit(0)
+        children.append(pid)
+    try:
+        srv.serve_forever()
+    finally:
+        for pid in children:
+            try: os.kill(pid, signal.SIGTERM)
+            except OSError: pass
+
+def serve_waitress(host: str, port: int, workers: int, threads: int, keepalive: int):
+    """waitress: 단일 프로세스 멀티스레드 (pip install waitress)"""
+    from waitress import serve
+    serve(APP, host=host, port=port, threads=max(1, workers) * threads, channel_timeout=max(keepalive, 30))
+
+def serve_gunicorn(host: str, port: int, workers: int, threads: int, keepalive: int):
+    """gunicorn: pre-fork + gthread, preload_app으로 덱 공유 (pip install gunicorn)"""
+    from gunicorn.app.base import BaseApplication
+
+    class FlashApp(BaseApplication):
+        def load_config(self):
+            opts = {"bind": f"{host}:{port}", "workers": workers, "threads": threads,
+                    "worker_class": "gthread", "keepalive": keepalive, "preload_app": True}
+            for k, v in opts.items(): self.cfg.set(k, v)
+        def load(self):
+            return APP
+
+    FlashApp().run()
+
+BACKENDS = {"builtin": serve_builtin, "waitress": serve_waitress, "gunicorn": serve_gunicorn}
+
 def main():
+    parser = argparse.ArgumentParser(description="Flash Learning web")
+    parser.add_argument("--serve", action="store_true", help="개발 서버 대신 운영 서버로 실행")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="builtin")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--threads", type=int, default=8, help="워커당 스레드 (waitress/gunicorn)")
+    parser.add_argument("--keepalive", type=int, default=5, help="keep-alive 유지 시간(초)")
+    args = parser.parse_args()
+
     host = os.environ.get("HOST","0.0.0.0")
     port = int(os.environ.get("PORT","7860"))
+    STORE.warm()
+    flash_search.get_index()            # fork 전에 검색 색인 생성
     print(f" * open http://127.0.0.1:{port}  (mobile: http://<PC-IP>:{port})")
-    APP.run(host=host, port=port, debug=False)
+    if not args.serve:
+        APP.run(host=host, port=port, debug=False)
+        return
+    print(f" * serving with {args.backend}: workers={args.workers} threads={args.threads} keepalive={args.keepalive}s")
+    try:
+        BACKENDS[args.backend](host, port, args.workers, args.threads, args.keepalive)
+    except ImportError as ex:
+        sys.exit(f"backend '{args.backend}' 사용 불가: {ex} (pip install {args.backend} 또는 --backend builtin)")
 
 if __name__ == "__main__":
     main()